@@ -0,0 +1,179 @@
+"""
+Embedded SQLite backend for the queries in analysis.sql
+Loads the derived price frame into an in-memory exchange_rates table and
+regenerates the summary CSVs without a PostgreSQL server
+"""
+
+import csv
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+import atomic_io
+import data_cache
+from metrics import CRISIS_PERCENTILE
+
+# Configuration
+DATA_DIR = Path(__file__).parent
+
+TABLE_COLUMNS = ['date_gregorian', 'open_price', 'low_price', 'high_price', 'close_price',
+                 'ret_close_close', 'drawdown', 'vol_intraday', 'is_crisis']
+
+
+def _percentile_cont_sql(column, fraction):
+    """
+    Per-year PERCENTILE_CONT(fraction) for SQLite, which has no ordered-set
+    aggregates: rank rows once with window functions, then interpolate
+    between the two neighbouring ranks
+    """
+    return f"""
+    SELECT
+      year,
+      lo_value + frac * (COALESCE(hi_value, lo_value) - lo_value) AS threshold
+    FROM (
+      SELECT
+        year,
+        MAX(CASE WHEN rn = lo_rank THEN {column} END) AS lo_value,
+        MAX(CASE WHEN rn = lo_rank + 1 THEN {column} END) AS hi_value,
+        MAX(pos - lo_rank) AS frac
+      FROM (
+        SELECT
+          year,
+          {column},
+          rn,
+          {fraction} * (n - 1) AS pos,
+          CAST({fraction} * (n - 1) AS INTEGER) AS lo_rank
+        FROM (
+          SELECT
+            CAST(strftime('%Y', date_gregorian) AS INTEGER) AS year,
+            {column},
+            ROW_NUMBER() OVER (PARTITION BY strftime('%Y', date_gregorian) ORDER BY {column}) - 1 AS rn,
+            COUNT(*) OVER (PARTITION BY strftime('%Y', date_gregorian)) AS n
+          FROM exchange_rates
+          WHERE {column} IS NOT NULL
+        )
+      )
+      GROUP BY year
+    )
+    """
+
+
+# SQLite translations of analysis.sql, keyed by the CSV they produce
+QUERIES = {
+    'avg_close_price': """
+        SELECT
+            CAST(strftime('%Y', date_gregorian) AS INTEGER) AS year,
+            ROUND(AVG(close_price) / 10, 2) AS avg_close_tmn
+        FROM exchange_rates
+        GROUP BY year
+        ORDER BY year
+    """,
+    'volatility': """
+        SELECT
+          strftime('%Y-%m-01 00:00:00', date_gregorian) AS month,
+          ROUND(AVG(vol_intraday), 4) AS avg_volatility
+        FROM exchange_rates
+        GROUP BY month
+        ORDER BY month
+    """,
+    'crisis_thresholds': f"""
+        SELECT r.year, r.threshold AS ret_threshold, d.threshold AS dd_threshold
+        FROM ({_percentile_cont_sql('ret_close_close', CRISIS_PERCENTILE)}) r
+        JOIN ({_percentile_cont_sql('drawdown', CRISIS_PERCENTILE)}) d ON d.year = r.year
+        ORDER BY r.year
+    """,
+    'crisis_days': """
+        SELECT
+          CAST(strftime('%Y', date_gregorian) AS INTEGER) AS year,
+          SUM(is_crisis) AS crisis_days,
+          COUNT(*) AS total_days,
+          ROUND(100.0 * SUM(is_crisis) / COUNT(*), 2) AS pct_crisis_days
+        FROM exchange_rates
+        GROUP BY year
+        ORDER BY year
+    """,
+    'crisis_dates': """
+        SELECT
+            date_gregorian,
+            close_price,
+            ret_close_close,
+            drawdown,
+            vol_intraday,
+            is_crisis
+        FROM exchange_rates
+        WHERE is_crisis = 1
+        ORDER BY date_gregorian
+    """,
+    'compare_return': """
+        SELECT
+            CASE WHEN is_crisis = 1 THEN 'Crisis Day' ELSE 'Normal Day' END AS day_type,
+            ROUND(AVG(ret_close_close), 4) AS avg_return,
+            ROUND(AVG(drawdown), 4) AS avg_drawdown,
+            COUNT(*) AS num_days
+        FROM exchange_rates
+        GROUP BY day_type
+    """,
+}
+
+# The UPDATE from analysis.sql, with the per-year thresholds computed once
+# into a temp table instead of two correlated subqueries per row
+CLASSIFY_BY_PERCENTILE = """
+    UPDATE exchange_rates
+    SET is_crisis = CASE
+      WHEN ret_close_close <= t.ret_threshold OR drawdown <= t.dd_threshold
+      THEN 1 ELSE 0
+    END
+    FROM crisis_thresholds t
+    WHERE t.year = CAST(strftime('%Y', exchange_rates.date_gregorian) AS INTEGER)
+"""
+
+# Summary tables written next to the dataset
+SUMMARY_FILES = {
+    'avg_close_price': 'avg_close_price.csv',
+    'volatility': 'volatility.csv',
+    'crisis_days': 'crisis_days.csv',
+    'compare_return': 'compare_return.csv',
+}
+
+
+def connect(df=None):
+    """Open an in-memory database holding the exchange_rates table"""
+    if df is None:
+        df = data_cache.load_price_frame()
+
+    conn = sqlite3.connect(':memory:')
+    table = df[TABLE_COLUMNS].copy()
+    table['date_gregorian'] = table['date_gregorian'].dt.strftime('%Y-%m-%d %H:%M:%S')
+    table.to_sql('exchange_rates', conn, index=False)
+    conn.execute("CREATE INDEX idx_exchange_rates_date ON exchange_rates (date_gregorian)")
+    return conn
+
+
+def run_query(conn, name):
+    """Run one of the named analysis queries into a DataFrame"""
+    return pd.read_sql_query(QUERIES[name], conn)
+
+
+def classify_by_percentile(conn):
+    """Set is_crisis using the per-year 5% return/drawdown thresholds"""
+    conn.execute("DROP TABLE IF EXISTS temp.crisis_thresholds")
+    conn.execute(f"CREATE TEMP TABLE crisis_thresholds AS {QUERIES['crisis_thresholds']}")
+    conn.execute(CLASSIFY_BY_PERCENTILE)
+    conn.commit()
+
+
+def export_summaries(conn, data_dir=DATA_DIR, snapshot_copy=False):
+    """
+    Regenerate the analysis.sql summary CSVs
+    Crisis tables use the percentile classification, as analysis.sql does
+    """
+    classify_by_percentile(conn)
+
+    written = []
+    for name, filename in SUMMARY_FILES.items():
+        path = Path(data_dir) / filename
+        atomic_io.write_csv(run_query(conn, name), path, snapshot_copy,
+                            index=False, quoting=csv.QUOTE_ALL)
+        written.append(path)
+    return written
@@ -0,0 +1,131 @@
+"""
+Crash-safe file writes for the updater's outputs
+Data goes to a temp file in the target's directory, is fsynced and then
+renamed over the target, so a reader sees either the old or the new file,
+never a truncated one. Written files can also be kept as versioned
+snapshots named by content hash
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+import hashlib
+import json
+import os
+from pathlib import Path
+import secrets
+import shutil
+
+DATA_DIR = Path(__file__).parent
+SNAPSHOT_DIR = DATA_DIR / '.snapshots'
+
+# Snapshots kept per file
+SNAPSHOTS_KEPT = int(os.environ.get('UPDATE_SNAPSHOTS_KEPT', 7))
+
+_TEMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
+
+def _create_temp(path):
+    """
+    Create a uniquely named temp file next to path
+    Unlike mkstemp (always 0600), it is created 0666 so the process umask
+    applies as for any new file
+    """
+    while True:
+        tmp_path = path.parent / f'.{path.name}.{secrets.token_hex(4)}.tmp'
+        try:
+            return os.open(tmp_path, _TEMP_FLAGS, 0o666), tmp_path
+        except FileExistsError:
+            continue
+
+
+def _existing_mode(path):
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        return None
+
+
+def _fsync_dir(directory):
+    """Persist a rename by syncing its directory (POSIX only)"""
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(path, mode='w', **open_kwargs):
+    """
+    Open a temp file next to path; on a clean exit it is fsynced and
+    renamed over path, on an error it is removed and path is untouched
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = _create_temp(path)
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # A replaced file keeps its permissions
+        existing_mode = _existing_mode(path)
+        if existing_mode is not None:
+            os.chmod(tmp_path, existing_mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+
+def content_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def snapshot(path, keep=SNAPSHOTS_KEPT, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Copy path to <snapshot_dir>/<name>/<timestamp>-<hash><suffix>, unless
+    the newest snapshot already has the same content; older snapshots
+    beyond `keep` are pruned. Returns the snapshot path
+    """
+    path = Path(path)
+    directory = Path(snapshot_dir) / path.stem
+    digest = content_hash(path)[:12]
+    existing = sorted(directory.glob(f'*{path.suffix}')) if directory.exists() else []
+    if existing and existing[-1].stem.endswith(digest):
+        return existing[-1]
+
+    target = directory / f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{digest}{path.suffix}"
+    with open(path, 'rb') as src, atomic_write(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+
+    existing.append(target)
+    if keep > 0:
+        for old in existing[:-keep]:
+            old.unlink(missing_ok=True)
+    return target
+
+
+def write_csv(df, path, snapshot_copy=False, **to_csv_kwargs):
+    """Atomically write a frame as CSV (optionally keeping a snapshot)"""
+    with atomic_write(path, newline='', encoding='utf-8') as f:
+        df.to_csv(f, **to_csv_kwargs)
+    if snapshot_copy:
+        snapshot(path)
+    return Path(path)
+
+
+def write_json(obj, path, **dump_kwargs):
+    with atomic_write(path, encoding='utf-8') as f:
+        json.dump(obj, f, **dump_kwargs)
+    return Path(path)
@@ -4,47 +4,103 @@ Fetches latest exchange rate data and news headlines automatically
 Run this script daily/weekly to keep your dashboard current
 """
 
-import pandas as pd
-import requests
 from datetime import datetime, timedelta
 import os
+import time
 from pathlib import Path
 
+import analytics_db
+import atomic_io
+import data_cache
+import data_manifest
+import metrics
+import news_fetcher
+import series_registry
+import tick_stream
+import validation
+from news_store import NewsStore
+
 # Configuration
 DATA_DIR = Path(__file__).parent
 EXCHANGE_RATE_FILE = DATA_DIR / 'Dollar_Rial_Price_Dataset.csv'
 NEWS_FILE = DATA_DIR / 'crisis_days_with_news_english.csv'
 
-def fetch_latest_exchange_rates():
+# Optional tick feed (file path or tcp://host:port) to build daily bars from;
+# the 'stub' test feed is refused because it makes up prices
+TICK_SOURCE = os.environ.get('EXCHANGE_RATE_TICKS')
+
+
+def load_exchange_rates(context):
+    """
+    Load the derived price frame shared with the dashboard
+    This is the only read of the dataset; later stages use context['prices']
+    and the validation report written while deriving it
+    """
+    print("📂 Loading exchange rate data...")
+    
+    try:
+        context['prices'] = data_cache.load_price_frame(EXCHANGE_RATE_FILE)
+        context['validation'] = validation.read_report(EXCHANGE_RATE_FILE)
+        print(f"   ✅ Loaded {len(context['prices']):,} records")
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ Error loading exchange rates: {e}")
+        return False
+
+
+def load_news(path=NEWS_FILE):
+    """
+    Load the headline file into a date-indexed store
+    """
+    return NewsStore.from_csv(path)
+
+
+def fetch_latest_exchange_rates(context):
     """
     Fetch latest USD/IRR exchange rates
-    Note: You'll need to find a suitable API or data source
-    This is a placeholder that shows the structure
+    With EXCHANGE_RATE_TICKS set, completed days are built from the tick
+    feed first (tick_stream); otherwise the dataset is updated by hand
     """
-    print("📊 Fetching latest exchange rates...")
+    print("\n📊 Fetching latest exchange rates...")
     
-    # Option 1: Manual update - Download from your data source
-    # For production, you would integrate with:
+    # For production, point EXCHANGE_RATE_TICKS at a feed from e.g.
     # - Central Bank APIs
     # - Financial data providers (Alpha Vantage, etc.)
     # - Web scraping from official sources
     
     try:
-        # Load existing data
-        df_existing = pd.read_csv(EXCHANGE_RATE_FILE)
+        if TICK_SOURCE == 'stub':
+            print("   ❌ EXCHANGE_RATE_TICKS=stub would write made-up prices into the dataset")
+            print("   📝 Test with: python3 tick_stream.py stub --csv <scratch copy of the dataset>")
+            return False
+        
+        if TICK_SOURCE:
+            # Days that ended before now become bars; today's stays open
+            before = len(context['prices'])
+            ticks = tick_stream.open_source(TICK_SOURCE, csv_path=EXCHANGE_RATE_FILE)
+            for _ in tick_stream.ingest(ticks, EXCHANGE_RATE_FILE, close_before=datetime.now(), publish_bars=False):
+                pass
+            context['prices'] = data_cache.load_price_frame(EXCHANGE_RATE_FILE)
+            context['validation'] = validation.read_report(EXCHANGE_RATE_FILE)
+            print(f"   ✅ Added {len(context['prices']) - before} daily bars from {TICK_SOURCE}")
         
         # Get last date in dataset
-        df_existing['Gregorian Date'] = pd.to_datetime(df_existing['Gregorian Date'], format='%Y/%m/%d')
-        last_date = df_existing['Gregorian Date'].max()
+        last_date = context['prices']['date_gregorian'].max()
         
         print(f"   Last date in dataset: {last_date.date()}")
         print(f"   Today: {datetime.now().date()}")
         
         days_behind = (datetime.now() - last_date).days
+        # With a tick feed, today's bar is only written once the day is over
+        allowed_lag = 1 if TICK_SOURCE else 0
         
-        if days_behind > 0:
+        if days_behind > allowed_lag:
             print(f"   ⚠️  Dataset is {days_behind} days behind")
-            print(f"   📝 Manual action required: Update {EXCHANGE_RATE_FILE} with latest data")
+            if TICK_SOURCE:
+                print(f"   📝 Tick feed {TICK_SOURCE} has no ticks for the missing days")
+            else:
+                print(f"   📝 Manual action required: Update {EXCHANGE_RATE_FILE} with latest data")
             return False
         else:
             print(f"   ✅ Dataset is up to date!")
@@ -55,28 +111,53 @@ def fetch_latest_exchange_rates():
         return False
 
 
-def fetch_latest_news():
+def validate_exchange_rates(context):
+    """
+    Report the validation of the dataset
+    load_price_frame runs the vectorized rules whenever the CSV changes,
+    keeping rows that break an error rule out of the derived frame and
+    writing them to the quarantine directory with a report
+    """
+    print("\n🔎 Validating exchange rate data...")
+    
+    try:
+        report = context.get('validation')
+        if report is None:
+            # The cache is current but its report was removed
+            result = metrics.check_price_csv(EXCHANGE_RATE_FILE)
+            validation.write_quarantine(result, EXCHANGE_RATE_FILE)
+            report = context['validation'] = result.report
+        
+        icon = "⚠️ " if report['quarantined'] else "✅"
+        for line in validation.format_report(report):
+            print(f"   {icon} {line}")
+            icon = "  "
+        if report['quarantined']:
+            rows_path = validation.quarantine_paths(EXCHANGE_RATE_FILE)[0]
+            print(f"   📝 Review quarantined rows in {rows_path}")
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ Error validating exchange rates: {e}")
+        return False
+
+
+def fetch_latest_news(context):
     """
     Fetch latest news headlines for recent crisis days using GDELT API
     """
     print("\n📰 Fetching latest news headlines...")
     
     try:
-        # Load existing data
-        df = pd.read_csv(EXCHANGE_RATE_FILE)
-        df['Gregorian Date'] = pd.to_datetime(df['Gregorian Date'], format='%Y/%m/%d', errors='coerce')
-        
-        # Calculate risk metrics for recent data
-        df = df.sort_values('Gregorian Date').reset_index(drop=True)
-        df['Close Price'] = pd.to_numeric(df['Close Price'], errors='coerce')
-        df['ret_close_close'] = df['Close Price'].pct_change()
-        df['running_peak'] = df['Close Price'].cummax()
-        df['drawdown'] = df['Close Price'] / df['running_peak'] - 1.0
-        df['is_crisis'] = ((df['ret_close_close'] < -0.05) | (df['drawdown'] <= -0.20)).astype(int)
+        df = context['prices']
+        
+        # Load existing news
+        news = load_news()
+        context['news'] = news
         
         # Get crisis days from last 30 days
         recent_date = datetime.now() - timedelta(days=30)
-        recent_crisis = df[(df['Gregorian Date'] >= recent_date) & (df['is_crisis'] == 1)]
+        recent_crisis = df[(df['date_gregorian'] >= recent_date) & (df['is_crisis'] == 1)]
         
         if len(recent_crisis) == 0:
             print("   ℹ️  No crisis days in the last 30 days")
@@ -84,63 +165,22 @@ def fetch_latest_news():
         
         print(f"   Found {len(recent_crisis)} crisis days in last 30 days")
         
-        # Load existing news
-        try:
-            existing_news = pd.read_csv(NEWS_FILE)
-            existing_news['date'] = pd.to_datetime(existing_news['date'])
-        except FileNotFoundError:
-            existing_news = pd.DataFrame(columns=['date', 'title', 'url', 'source'])
+        # Only fetch days we don't already have news for
+        missing_dates = news.missing_dates(list(recent_crisis['date_gregorian']))
         
-        # Fetch news for each crisis day
-        new_headlines = []
+        print(f"   Fetching news for {len(missing_dates)} days...")
         
-        for idx, row in recent_crisis.iterrows():
-            crisis_date = row['Gregorian Date']
-            
-            # Check if we already have news for this date
-            if len(existing_news[existing_news['date'].dt.date == crisis_date.date()]) > 0:
-                continue
-            
-            print(f"   Fetching news for {crisis_date.date()}...")
-            
-            # GDELT API query
-            date_str = crisis_date.strftime("%Y%m%d")
-            url = "https://api.gdeltproject.org/api/v2/doc/doc"
-            params = {
-                "query": "Iran currency exchange rate dollar sanctions",
-                "mode": "ArtList",
-                "format": "json",
-                "maxrecords": 10,
-                "sort": "DateDesc",
-                "startdatetime": f"{date_str}000000",
-                "enddatetime": f"{date_str}235959",
-            }
-            
-            try:
-                resp = requests.get(url, params=params, timeout=10)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    if "articles" in data:
-                        for art in data["articles"]:
-                            title = art.get("title", "")
-                            # Filter English headlines
-                            if any(c.isascii() and c.isalpha() for c in title):
-                                new_headlines.append({
-                                    "date": str(crisis_date),
-                                    "title": title,
-                                    "url": art.get("url"),
-                                    "source": art.get("domain")
-                                })
-            except Exception as e:
-                print(f"   ⚠️  Error fetching news for {crisis_date.date()}: {e}")
+        with news_fetcher.GdeltClient(cache=news_fetcher.ResponseCache()) as client:
+            new_headlines, errors = client.fetch_days(missing_dates)
+        
+        for crisis_date, e in errors.items():
+            print(f"   ⚠️  Error fetching news for {crisis_date.date()}: {e}")
         
         # Append new headlines to existing data
-        if new_headlines:
-            new_news_df = pd.DataFrame(new_headlines)
-            updated_news = pd.concat([existing_news, new_news_df], ignore_index=True)
-            updated_news = updated_news.drop_duplicates(subset=['date', 'title'])
-            updated_news.to_csv(NEWS_FILE, index=False)
-            print(f"   ✅ Added {len(new_headlines)} new headlines")
+        added = news.upsert(new_headlines)
+        if added:
+            news.to_csv(NEWS_FILE, snapshot_copy=True)
+            print(f"   ✅ Added {added} new headlines")
         else:
             print(f"   ℹ️  No new headlines to add")
         
@@ -151,47 +191,17 @@ def fetch_latest_news():
         return False
 
 
-def calculate_and_update_crisis_dates():
+def calculate_and_update_crisis_dates(context):
     """
     Recalculate crisis dates based on latest data
     """
     print("\n🚨 Updating crisis detection...")
     
     try:
-        df = pd.read_csv(EXCHANGE_RATE_FILE)
-        
-        # Rename columns
-        df = df.rename(columns={
-            "Open Price": "open_price",
-            "Low Price": "low_price",
-            "High Price": "high_price",
-            "Close Price": "close_price",
-            "Change Amount": "change_amount",
-            "Change Percent": "change_percent",
-            "Gregorian Date": "date_gregorian",
-            "Persian Date": "date_persian"
-        })
-        
-        # Convert date
-        df["date_gregorian"] = pd.to_datetime(df["date_gregorian"], format="%Y/%m/%d", errors="coerce")
-        
-        # Calculate metrics
-        df = df.sort_values('date_gregorian').reset_index(drop=True)
-        df["ret_close_close"] = df["close_price"].pct_change()
-        df["running_peak"] = df["close_price"].cummax()
-        df["drawdown"] = df["close_price"] / df["running_peak"] - 1.0
-        df["vol_intraday"] = (df["high_price"] - df["low_price"]) / df["open_price"]
-        
-        # Crisis detection
-        df["is_crisis"] = (
-            (df["ret_close_close"] < -0.05) | 
-            (df["drawdown"] <= -0.20)
-        ).astype(int)
-        
         # Save crisis dates
-        crisis_df = df[df["is_crisis"] == 1][['date_gregorian', 'close_price', 'ret_close_close', 
-                                               'drawdown', 'vol_intraday', 'is_crisis']]
-        crisis_df.to_csv(DATA_DIR / 'crisis_dates.csv', index=False)
+        crisis_df = metrics.crisis_days(context['prices'])
+        atomic_io.write_csv(crisis_df, DATA_DIR / 'crisis_dates.csv', snapshot_copy=True, index=False)
+        context['crisis'] = crisis_df
         
         print(f"   ✅ Updated crisis dates file")
         print(f"   Total crisis days: {len(crisis_df)}")
@@ -203,7 +213,68 @@ def calculate_and_update_crisis_dates():
         return False
 
 
-def generate_update_report():
+def update_summary_tables(context):
+    """
+    Regenerate the analysis.sql summary CSVs with the embedded SQLite backend
+    """
+    print("\n🗄️  Updating summary tables...")
+    
+    try:
+        conn = analytics_db.connect(context['prices'])
+        try:
+            written = analytics_db.export_summaries(conn, DATA_DIR, snapshot_copy=True)
+        finally:
+            conn.close()
+        
+        print(f"   ✅ Updated {', '.join(p.name for p in written)}")
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ Error updating summary tables: {e}")
+        return False
+
+
+def refresh_series_caches(context):
+    """
+    Derive every registered price series so dashboards read them from cache
+    """
+    print("\n💱 Refreshing price series...")
+    
+    try:
+        frames = series_registry.load_frames()
+        context['series'] = frames
+        
+        for symbol, frame in frames.items():
+            print(f"   ✅ {symbol}: {len(frame):,} records")
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ Error refreshing price series: {e}")
+        return False
+
+
+def publish_data_manifest(context):
+    """
+    Record the new dataset hashes so running dashboards reload them
+    """
+    print("\n🔖 Publishing data manifest...")
+    
+    try:
+        manifest, changed = data_manifest.write_manifest()
+        context['manifest'] = manifest
+        
+        if changed:
+            print(f"   ✅ Data version {manifest['epoch']}: {', '.join(changed)} changed")
+        else:
+            print(f"   ℹ️  No dataset changes (data version {manifest['epoch']})")
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ Error publishing data manifest: {e}")
+        return False
+
+
+def generate_update_report(context):
     """
     Generate a summary report of the update
     """
@@ -213,31 +284,43 @@ def generate_update_report():
     
     try:
         # Exchange rate data stats
-        df = pd.read_csv(EXCHANGE_RATE_FILE)
-        df['Gregorian Date'] = pd.to_datetime(df['Gregorian Date'], format='%Y/%m/%d')
+        df = context['prices']
         
         print(f"\n📈 Exchange Rate Data:")
         print(f"   Total records: {len(df):,}")
-        print(f"   Date range: {df['Gregorian Date'].min().date()} to {df['Gregorian Date'].max().date()}")
-        print(f"   Days of data: {(df['Gregorian Date'].max() - df['Gregorian Date'].min()).days}")
+        print(f"   Date range: {df['date_gregorian'].min().date()} to {df['date_gregorian'].max().date()}")
+        print(f"   Days of data: {(df['date_gregorian'].max() - df['date_gregorian'].min()).days}")
+        
+        # Validation stats
+        report = context.get('validation')
+        if report is not None:
+            print(f"\n🔎 Data Validation:")
+            for line in validation.format_report(report):
+                print(f"   {line}")
         
         # Crisis data stats
-        crisis_df = pd.read_csv(DATA_DIR / 'crisis_dates.csv')
-        print(f"\n🚨 Crisis Detection:")
-        print(f"   Total crisis days: {len(crisis_df):,}")
-        print(f"   Crisis percentage: {len(crisis_df)/len(df)*100:.1f}%")
+        crisis_df = context.get('crisis')
+        if crisis_df is not None:
+            print(f"\n🚨 Crisis Detection:")
+            print(f"   Total crisis days: {len(crisis_df):,}")
+            print(f"   Crisis percentage: {len(crisis_df)/len(df)*100:.1f}%")
         
         # News data stats
-        try:
-            news_df = pd.read_csv(NEWS_FILE)
-            news_df['date'] = pd.to_datetime(news_df['date'])
+        news = context.get('news')
+        if news is not None and len(news) > 0:
+            news_df = news.frame
             print(f"\n📰 News Headlines:")
             print(f"   Total headlines: {len(news_df):,}")
             print(f"   Unique crisis days with news: {news_df['date'].nunique()}")
             print(f"   Date range: {news_df['date'].min().date()} to {news_df['date'].max().date()}")
-        except FileNotFoundError:
+        else:
             print(f"\n📰 News Headlines: No data available")
         
+        # Stage timings
+        print(f"\n⏱️  Stage Timings:")
+        for name, elapsed in context['timings']:
+            print(f"   {name:<20} {elapsed * 1000:>9.1f} ms")
+        
         print(f"\n⏰ Update completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("="*60)
         
@@ -245,6 +328,29 @@ def generate_update_report():
         print(f"   ⚠️  Error generating report: {e}")
 
 
+# Pipeline stages, run in order against one shared context
+STAGES = [
+    ("load", load_exchange_rates),
+    ("freshness check", fetch_latest_exchange_rates),
+    ("validation", validate_exchange_rates),
+    ("crisis detection", calculate_and_update_crisis_dates),
+    ("summary tables", update_summary_tables),
+    ("news fetch", fetch_latest_news),
+    ("price series", refresh_series_caches),
+    ("data manifest", publish_data_manifest),
+]
+
+
+def run_stage(name, stage, context):
+    """
+    Run one pipeline stage and record how long it took
+    """
+    start = time.perf_counter()
+    ok = stage(context)
+    context['timings'].append((name, time.perf_counter() - start))
+    return ok
+
+
 def main():
     """
     Main update function
@@ -254,22 +360,22 @@ def main():
     print("="*60)
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
-    # Step 1: Check exchange rates
-    rates_updated = fetch_latest_exchange_rates()
-    
-    # Step 2: Recalculate crisis dates
-    crisis_updated = calculate_and_update_crisis_dates()
+    context = {'timings': []}
+    results = {}
     
-    # Step 3: Fetch latest news
-    news_updated = fetch_latest_news()
+    for name, stage in STAGES:
+        results[name] = run_stage(name, stage, context)
+        # Every later stage needs the price frame
+        if name == "load" and not results[name]:
+            break
     
-    # Step 4: Generate report
-    generate_update_report()
+    if 'prices' in context:
+        generate_update_report(context)
     
-    if rates_updated and crisis_updated and news_updated:
+    if len(results) == len(STAGES) and all(results.values()):
         print("\n✅ All updates completed successfully!")
         print("\n💡 Your dashboard will now show the latest data.")
-        print("   Restart Streamlit to see the updates.")
+        print("   Running dashboards reload changed datasets automatically (no restart needed).")
     else:
         print("\n⚠️  Some updates had issues. Check the logs above.")
     
@@ -0,0 +1,38 @@
+"""
+Chart factory for the dashboard's scatter/line traces
+Traces above WEBGL_THRESHOLD points are built as Scattergl (WebGL) instead
+of SVG Scatter; styling and hovertemplates are passed through unchanged
+"""
+
+import os
+
+import plotly.graph_objects as go
+
+from downsample import MAX_POINTS, downsample
+
+# Point count above which a trace is rendered with WebGL (same default as
+# plotly express' render_mode='auto'); override with DASHBOARD_WEBGL_THRESHOLD
+WEBGL_THRESHOLD = int(os.environ.get('DASHBOARD_WEBGL_THRESHOLD', 1000))
+
+
+def use_webgl(n_points, threshold=None):
+    threshold = WEBGL_THRESHOLD if threshold is None else threshold
+    return n_points > threshold
+
+
+def render_mode(n_points, threshold=None):
+    """render_mode argument for plotly express line/scatter figures"""
+    return 'webgl' if use_webgl(n_points, threshold) else 'svg'
+
+
+def scatter(x, y, webgl_threshold=None, **kwargs):
+    """go.Scatter, or go.Scattergl once the trace passes the threshold"""
+    trace_type = go.Scattergl if use_webgl(len(x), webgl_threshold) else go.Scatter
+    return trace_type(x=x, y=y, **kwargs)
+
+
+def line(x, y, max_points=MAX_POINTS, webgl_threshold=None, **kwargs):
+    """Downsampled line trace"""
+    x, y = downsample(x, y, max_points)
+    kwargs.setdefault('mode', 'lines')
+    return scatter(x, y, webgl_threshold=webgl_threshold, **kwargs)
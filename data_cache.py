@@ -0,0 +1,175 @@
+"""
+Columnar cache for the exchange rate dataset
+Stores the fully derived price frame as Parquet next to a small fingerprint
+file, so new processes can skip CSV parsing and metric derivation
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+import atomic_io
+import metrics
+import validation
+from metric_engine import MetricEngine
+
+# Configuration
+DATA_DIR = Path(__file__).parent
+EXCHANGE_RATE_FILE = DATA_DIR / 'Dollar_Rial_Price_Dataset.csv'
+CACHE_DIR = DATA_DIR / '.cache'
+
+# Bump when the derived columns change so stale caches are rebuilt
+CACHE_FORMAT_VERSION = 4
+
+
+def extend_price_frame(cached, raw):
+    """
+    Derive only the rows of raw that come after the cached frame
+    Returns None when raw is not an append-only extension of cached, in
+    which case the caller must rebuild from scratch
+    """
+    n = len(cached)
+    if n == 0 or len(raw) <= n:
+        return None
+
+    # Every raw column of the cached rows must be unchanged; a corrected
+    # historical value means the derived columns need a full rebuild
+    head = raw.iloc[:n].reset_index(drop=True)
+    cached_rows = cached.reset_index(drop=True)
+    same_history = all(head[col].equals(cached_rows[col]) for col in raw.columns if col in cached.columns)
+    if not same_history:
+        return None
+
+    engine = MetricEngine.from_frame(cached)
+    new_rows = metrics.add_time_features(engine.append(raw.iloc[n:]))[cached.columns]
+
+    # Keep the cached dtypes (e.g. integer running_peak) where values allow
+    for col, dtype in cached.dtypes.items():
+        try:
+            new_rows[col] = new_rows[col].astype(dtype)
+        except (TypeError, ValueError):
+            pass
+
+    return pd.concat([cached, new_rows], ignore_index=True)
+
+
+def _cache_paths(csv_path):
+    stem = Path(csv_path).stem
+    return CACHE_DIR / f'{stem}.parquet', CACHE_DIR / f'{stem}.meta.json'
+
+
+def file_fingerprint(csv_path, with_hash=True):
+    """Return size, mtime and (optionally) content hash of a file"""
+    stat = os.stat(csv_path)
+    fingerprint = {
+        'format': CACHE_FORMAT_VERSION,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+    if with_hash:
+        fingerprint['sha256'] = atomic_io.content_hash(csv_path)
+    return fingerprint
+
+
+def source_version(path):
+    """Cheap token that changes whenever a source file does (None if missing)"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _is_fresh(meta, csv_path, meta_path=None):
+    """
+    Check a stored fingerprint against the CSV
+    Size and mtime are compared first; the content hash is only computed
+    when they differ (e.g. after a checkout that touched the file). On a
+    hash match the new mtime is saved to meta_path, so later checks skip
+    hashing again
+    """
+    if meta is None or meta.get('format') != CACHE_FORMAT_VERSION:
+        return False
+
+    current = file_fingerprint(csv_path, with_hash=False)
+    if current['size'] != meta.get('size'):
+        return False
+    if current['mtime_ns'] == meta.get('mtime_ns'):
+        return True
+    if atomic_io.content_hash(csv_path) != meta.get('sha256'):
+        return False
+    if meta_path is not None:
+        atomic_io.write_json({**meta, **current}, meta_path)
+    return True
+
+
+def is_cached(csv_path=EXCHANGE_RATE_FILE):
+    """Whether load_price_frame can be served from the cache without deriving"""
+    parquet_path, meta_path = _cache_paths(csv_path)
+    return parquet_path.exists() and _is_fresh(_read_meta(meta_path), csv_path, meta_path)
+
+
+def write_price_cache(df, csv_path=EXCHANGE_RATE_FILE):
+    """Persist a derived frame as the cache for csv_path"""
+    parquet_path, meta_path = _cache_paths(csv_path)
+    CACHE_DIR.mkdir(exist_ok=True)
+
+    try:
+        with atomic_io.atomic_write(parquet_path, 'wb') as f:
+            df.to_parquet(f, index=False)
+    except ImportError:
+        # No Parquet engine installed - run without the cache
+        return False
+
+    atomic_io.write_json(file_fingerprint(csv_path), meta_path)
+    return True
+
+
+def refresh_price_cache(csv_path=EXCHANGE_RATE_FILE, checked=None):
+    """Rebuild the cache from the CSV and return the derived frame"""
+    checked = checked or metrics.check_price_csv(csv_path)
+    validation.write_quarantine(checked, csv_path)
+    df = metrics.compute_metrics(checked.valid.copy())
+    write_price_cache(df, csv_path)
+    return df
+
+
+def load_price_frame(csv_path=EXCHANGE_RATE_FILE):
+    """
+    Load the derived price frame, using the Parquet cache when it matches
+    the CSV. When the CSV only gained new rows, the cached history is
+    extended incrementally instead of being recomputed
+    """
+    parquet_path, meta_path = _cache_paths(csv_path)
+
+    cached = None
+    if parquet_path.exists():
+        try:
+            cached = pd.read_parquet(parquet_path, memory_map=True)
+        except (ImportError, OSError, ValueError):
+            cached = None
+
+    meta = _read_meta(meta_path)
+    if cached is not None and _is_fresh(meta, csv_path, meta_path):
+        return cached
+
+    # The CSV changed: validate it once, then extend or rebuild
+    checked = metrics.check_price_csv(csv_path)
+    if cached is not None and meta is not None and meta.get('format') == CACHE_FORMAT_VERSION:
+        df = extend_price_frame(cached, checked.valid)
+        if df is not None:
+            validation.write_quarantine(checked, csv_path)
+            write_price_cache(df, csv_path)
+            return df
+
+    return refresh_price_cache(csv_path, checked)
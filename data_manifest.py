@@ -0,0 +1,132 @@
+"""
+Data-version manifest shared by the updater and the dashboard
+auto_update hashes its output files into data_manifest.json after each
+run; the dashboard polls that file and reloads only the datasets whose
+hash changed, so new data shows up without restarting Streamlit
+"""
+
+from datetime import datetime
+import json
+import os
+import threading
+import time
+
+import atomic_io
+import data_cache
+import series_registry
+
+DATA_DIR = data_cache.DATA_DIR
+MANIFEST_FILE = DATA_DIR / 'data_manifest.json'
+
+# Datasets tracked by the manifest, including every registered price series
+DATASETS = {
+    'prices': data_cache.EXCHANGE_RATE_FILE,
+    'crisis_dates': DATA_DIR / 'crisis_dates.csv',
+    'news': DATA_DIR / 'crisis_days_with_news_english.csv',
+    **{series_registry.dataset_name(symbol): path
+       for symbol, path in series_registry.SERIES.items()},
+}
+
+# How often running dashboards check the manifest (seconds)
+POLL_SECONDS = float(os.environ.get('DASHBOARD_RELOAD_SECONDS', 5))
+
+
+def dataset_entry(path):
+    """Content hash and size of one dataset (None if the file is missing)"""
+    if not os.path.exists(path):
+        return None
+    fingerprint = data_cache.file_fingerprint(path)
+    return {'sha256': fingerprint['sha256'], 'size': fingerprint['size']}
+
+
+def read_manifest(path=MANIFEST_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_manifest(datasets=DATASETS, path=MANIFEST_FILE):
+    """
+    Hash the datasets and atomically replace the manifest
+    The epoch only advances when a dataset changed; returns
+    (manifest, names of the changed datasets)
+    """
+    previous = read_manifest(path) or {}
+    previous_entries = previous.get('datasets', {})
+    entries = {name: dataset_entry(p) for name, p in datasets.items()}
+    changed = [name for name, entry in entries.items() if entry != previous_entries.get(name)]
+
+    manifest = {
+        'epoch': previous.get('epoch', 0) + (1 if changed else 0),
+        'updated_at': datetime.now().isoformat(timespec='seconds') if changed else previous.get('updated_at'),
+        'datasets': entries,
+    }
+
+    atomic_io.write_json(manifest, path, indent=2)
+    return manifest, changed
+
+
+def dataset_versions(manifest=None, datasets=DATASETS):
+    """
+    Version token per dataset: the manifest hash when a manifest exists,
+    otherwise the file's size/mtime
+    """
+    if manifest is None:
+        return {name: data_cache.source_version(p) for name, p in datasets.items()}
+    entries = manifest.get('datasets', {})
+    return {name: (entries.get(name) or {}).get('sha256') for name in datasets}
+
+
+class ManifestWatcher:
+    """
+    Polls the manifest from a daemon thread
+    When dataset versions change, reload(versions, changed) runs in that
+    thread first and `versions` switches to the new set only afterwards,
+    so readers never see a half-loaded version
+    """
+
+    def __init__(self, reload, path=MANIFEST_FILE, interval=POLL_SECONDS):
+        self.reload = reload
+        self.path = path
+        self.interval = interval
+        self._mtime = self._manifest_mtime()
+        self.manifest = read_manifest(path)
+        self.versions = dataset_versions(self.manifest)
+        self.error = None
+        self._lock = threading.Lock()
+        if interval > 0:
+            threading.Thread(target=self._run, name='manifest-watcher', daemon=True).start()
+
+    def _manifest_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def check(self):
+        """Reload if the manifest changed; returns the names of changed datasets"""
+        with self._lock:
+            mtime = self._manifest_mtime()
+            if mtime == self._mtime:
+                return []
+            manifest = read_manifest(self.path)
+            versions = dataset_versions(manifest)
+            changed = [name for name in versions if versions[name] != self.versions.get(name)]
+            if changed:
+                self.reload(versions, changed)
+            self._mtime = mtime
+            self.manifest = manifest
+            self.versions = versions
+            return changed
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.check()
+                self.error = None
+            except Exception as e:
+                # Keep serving the current versions; retry on the next poll
+                self.error = e
@@ -0,0 +1,131 @@
+"""
+Server-side downsampling for time-series traces
+Largest-Triangle-Three-Buckets keeps the visual shape of a line with a
+fixed number of points; min/max bucketing keeps every spike. Series at or
+below the point budget are passed through untouched
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+MAX_POINTS = 2000
+
+
+def _as_float_x(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = _as_float_x(x)
+    y = np.asarray(y, dtype=float)
+
+    # Bucket edges over the interior points; first and last are always kept
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    prev = 0
+    for b in range(n_out - 2):
+        start, stop = edges[b], edges[b + 1]
+        if b + 2 < len(edges):
+            next_start, next_stop = edges[b + 1], edges[b + 2]
+            avg_x = x[next_start:next_stop].mean()
+            avg_y = y[next_start:next_stop].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        # Twice the triangle area formed with the previous point and next average
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:stop] - y[prev]) -
+            (x[prev] - x[start:stop]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        keep[b + 1] = prev
+    return keep
+
+
+def minmax_indices(y, n_out):
+    """Indices of each bucket's minimum and maximum (about n_out points)"""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    n_buckets = n_out // 2
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    keep = []
+    for start, stop in zip(edges[:-1], edges[1:]):
+        if stop <= start:
+            continue
+        chunk = y[start:stop]
+        keep.append(start + int(np.argmin(chunk)))
+        keep.append(start + int(np.argmax(chunk)))
+    return np.unique(keep)
+
+
+def downsample(x, y, max_points=MAX_POINTS, method='lttb'):
+    """
+    Reduce an (x, y) series to at most max_points for plotting
+    NaN points are dropped first (they only pad rolling-window starts)
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    valid = ~np.isnan(y)
+    if not valid.all():
+        x, y = x[valid], y[valid]
+
+    if len(y) <= max_points:
+        return x, y
+    if method == 'minmax':
+        idx = minmax_indices(y, max_points)
+    else:
+        idx = lttb_indices(x, y, max_points)
+    return x[idx], y[idx]
+
+
+def trace_xy(x, y, max_points=MAX_POINTS, method='lttb'):
+    """Downsampled x/y keyword arguments for a line trace"""
+    x, y = downsample(x, y, max_points, method)
+    return {'x': x, 'y': y}
+
+
+def payload_bytes(x, y):
+    """Approximate JSON size of a trace's data, as sent to the browser"""
+    x = pd.to_datetime(x).strftime('%Y-%m-%d %H:%M:%S').tolist() if np.issubdtype(np.asarray(x).dtype, np.datetime64) else list(x)
+    return len(json.dumps({'x': x, 'y': np.asarray(y, dtype=float).tolist()}))
+
+
+if __name__ == "__main__":
+    # Benchmark: payload size and time for the daily history and a synthetic
+    # minute-level series of the same shape
+    import time
+
+    import data_cache
+
+    df = data_cache.load_price_frame()
+    minutes = pd.date_range(df['date_gregorian'].min(), periods=2_000_000, freq='min')
+    synthetic = np.exp(np.cumsum(np.random.default_rng(0).normal(0, 1e-4, len(minutes)))) * 1e5
+
+    series = [
+        ("daily close", df['date_gregorian'].to_numpy(), df['close_price'].to_numpy()),
+        ("minute close", minutes.to_numpy(), synthetic),
+    ]
+    for name, x, y in series:
+        for method in ('lttb', 'minmax'):
+            start = time.perf_counter()
+            dx, dy = downsample(x, y, method=method)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<13} {method:<7} {len(y):>9,} -> {len(dy):>5,} points  "
+                  f"{payload_bytes(x, y) / 1024:>9,.0f} KB -> {payload_bytes(dx, dy) / 1024:>6,.0f} KB  "
+                  f"({elapsed * 1000:.1f} ms)")
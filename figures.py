@@ -0,0 +1,425 @@
+"""
+Plotly figure builders for the dashboard pages
+Each builder is a pure function of the frames and parameters it is given,
+so its serialized JSON can be cached and reused across reruns
+"""
+
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+import charts
+
+CRISIS_COLORS = {0: '#2E86AB', 1: '#EE4B2B'}
+
+
+# Overview
+def price_with_crisis(df, crisis):
+    fig = go.Figure()
+
+    fig.add_trace(charts.line(
+        df['date_gregorian'], df['close_price'],
+        name='Close Price',
+        line=dict(color='#2E86AB', width=2),
+        hovertemplate='<b>Date:</b> %{x|%Y-%m-%d}<br><b>Price:</b> %{y:,.0f}<extra></extra>'
+    ))
+
+    fig.add_trace(charts.scatter(
+        crisis['date_gregorian'],
+        crisis['close_price'],
+        mode='markers',
+        name='Crisis Days',
+        marker=dict(color='#EE4B2B', size=5, opacity=0.7),
+        hovertemplate='<b>Crisis Day</b><br><b>Date:</b> %{x|%Y-%m-%d}<br><b>Price:</b> %{y:,.0f}<extra></extra>'
+    ))
+
+    fig.update_layout(
+        height=500,
+        hovermode='x unified',
+        template='plotly_white',
+        xaxis_title='Date',
+        yaxis_title='Close Price (Rials per USD)',
+        showlegend=True
+    )
+    return fig
+
+
+def crisis_days_by_year(yearly_crisis):
+    fig = px.bar(
+        yearly_crisis,
+        x='year',
+        y='crisis_days',
+        color='crisis_pct',
+        color_continuous_scale='Reds',
+        labels={'crisis_days': 'Number of Crisis Days', 'year': 'Year', 'crisis_pct': 'Crisis %'}
+    )
+    fig.update_layout(height=350, template='plotly_white')
+    return fig
+
+
+def avg_price_by_year(yearly_avg):
+    fig = px.line(
+        yearly_avg,
+        x='year',
+        y='close_price',
+        markers=True,
+        render_mode=charts.render_mode(len(yearly_avg)),
+        labels={'close_price': 'Average Close Price', 'year': 'Year'}
+    )
+    fig.update_traces(line_color='#2E86AB', line_width=3)
+    fig.update_layout(height=350, template='plotly_white')
+    return fig
+
+
+# Time series
+def moving_averages(df, ts_frame, short_window, long_window):
+    fig = go.Figure()
+
+    fig.add_trace(charts.line(
+        df['date_gregorian'], df['close_price'],
+        name='Close Price',
+        line=dict(color='#2E86AB', width=1),
+        opacity=0.7
+    ))
+
+    fig.add_trace(charts.line(
+        ts_frame['date_gregorian'], ts_frame[f'ma_{short_window}d'],
+        name=f'{short_window}-Day MA',
+        line=dict(color='#F28C28', width=2)
+    ))
+
+    fig.add_trace(charts.line(
+        ts_frame['date_gregorian'], ts_frame[f'ma_{long_window}d'],
+        name=f'{long_window}-Day MA',
+        line=dict(color='#EE4B2B', width=2)
+    ))
+
+    fig.update_layout(
+        height=500,
+        template='plotly_white',
+        xaxis_title='Date',
+        yaxis_title='Price (Rials per USD)',
+        hovermode='x unified'
+    )
+    return fig
+
+
+def returns_histogram(df):
+    fig = px.histogram(
+        df,
+        x='ret_close_close',
+        nbins=50,
+        color='is_crisis',
+        color_discrete_map=CRISIS_COLORS,
+        labels={'ret_close_close': 'Daily Return', 'is_crisis': 'Crisis'},
+        opacity=0.7,
+        barmode='overlay'
+    )
+    fig.update_layout(height=400, template='plotly_white', showlegend=True)
+    return fig
+
+
+def rolling_volatility(ts_frame, short_window, long_window):
+    fig = go.Figure()
+
+    fig.add_trace(charts.line(
+        ts_frame['date_gregorian'], ts_frame[f'vol_{short_window}d'],
+        name=f'{short_window}-Day',
+        line=dict(color='#A23E48', width=1.5)
+    ))
+
+    fig.add_trace(charts.line(
+        ts_frame['date_gregorian'], ts_frame[f'vol_{long_window}d'],
+        name=f'{long_window}-Day',
+        line=dict(color='#6A0572', width=2)
+    ))
+
+    fig.update_layout(
+        height=400,
+        template='plotly_white',
+        xaxis_title='Date',
+        yaxis_title='Volatility (Std Dev)',
+        hovermode='x unified'
+    )
+    return fig
+
+
+def monthly_returns(monthly_avg):
+    fig = px.bar(
+        monthly_avg,
+        x='month_name',
+        y='ret_close_close',
+        color='ret_close_close',
+        color_continuous_scale='RdYlGn_r',
+        labels={'ret_close_close': 'Avg Return', 'month_name': 'Month'}
+    )
+    fig.update_layout(height=400, template='plotly_white', title='Average Returns by Month')
+    return fig
+
+
+def quarterly_crisis_pie(quarterly_crisis):
+    fig = px.pie(
+        quarterly_crisis,
+        values='is_crisis',
+        names='quarter',
+        title='Crisis Days by Quarter',
+        color_discrete_sequence=px.colors.sequential.Reds_r
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+# Crisis analysis
+def drawdown(df, threshold_line=True):
+    fig = go.Figure()
+
+    fig.add_trace(charts.line(
+        df['date_gregorian'], df['drawdown'] * 100,
+        fill='tozeroy',
+        name='Drawdown',
+        line=dict(color='#6A0572', width=1),
+        fillcolor='rgba(106, 5, 114, 0.3)'
+    ))
+
+    if threshold_line:
+        fig.add_hline(
+            y=-20,
+            line_dash="dash",
+            line_color="red",
+            annotation_text="Crisis Threshold (-20%)",
+            annotation_position="right"
+        )
+
+    fig.update_layout(
+        height=400,
+        template='plotly_white',
+        xaxis_title='Date',
+        yaxis_title='Drawdown (%)',
+        hovermode='x unified'
+    )
+    return fig
+
+
+def crisis_return_comparison(comparison_data):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name='Avg Return (%)',
+        x=comparison_data['Type'],
+        y=comparison_data['Avg Return'],
+        marker_color=['#2E86AB', '#EE4B2B']
+    ))
+
+    fig.update_layout(height=400, template='plotly_white', yaxis_title='Average Return (%)')
+    return fig
+
+
+def intraday_volatility_box(df):
+    fig = px.box(
+        df,
+        x='is_crisis',
+        y='vol_intraday',
+        color='is_crisis',
+        color_discrete_map=CRISIS_COLORS,
+        labels={'is_crisis': 'Day Type', 'vol_intraday': 'Intraday Volatility'}
+    )
+    fig.update_layout(height=400, template='plotly_white', showlegend=False)
+    fig.update_xaxes(ticktext=['Normal Days', 'Crisis Days'], tickvals=[0, 1])
+    return fig
+
+
+def crisis_timeline(yearly_crisis):
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=('Crisis Days by Year', 'Crisis Percentage by Year'),
+        vertical_spacing=0.15
+    )
+
+    fig.add_trace(
+        go.Bar(x=yearly_crisis['year'], y=yearly_crisis['crisis_days'],
+               marker_color='#EE4B2B', name='Crisis Days'),
+        row=1, col=1
+    )
+
+    fig.add_trace(
+        charts.scatter(yearly_crisis['year'], yearly_crisis['crisis_pct'],
+                       mode='lines+markers', marker_color='#F28C28', name='Crisis %',
+                       line=dict(width=3)),
+        row=2, col=1
+    )
+
+    fig.update_xaxes(title_text="Year", row=2, col=1)
+    fig.update_yaxes(title_text="Number of Days", row=1, col=1)
+    fig.update_yaxes(title_text="Percentage (%)", row=2, col=1)
+
+    fig.update_layout(height=600, showlegend=False, template='plotly_white')
+    return fig
+
+
+# News impact
+def news_volume(news):
+    news_by_date = news.groupby(news['date'].dt.date).size().reset_index()
+    news_by_date.columns = ['date', 'count']
+
+    fig = px.bar(
+        news_by_date,
+        x='date',
+        y='count',
+        labels={'count': 'Number of Headlines', 'date': 'Date'},
+        color='count',
+        color_continuous_scale='Reds'
+    )
+    fig.update_layout(height=400, template='plotly_white', showlegend=False)
+    return fig
+
+
+def top_sources(news, n=10):
+    sources = news['source'].value_counts().head(n).reset_index()
+    sources.columns = ['source', 'count']
+
+    fig = px.bar(
+        sources,
+        y='source',
+        x='count',
+        orientation='h',
+        labels={'count': 'Number of Articles', 'source': 'Source'},
+        color='count',
+        color_continuous_scale='Blues'
+    )
+    fig.update_layout(height=400, template='plotly_white', showlegend=False)
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+
+def news_timeline(news):
+    news_monthly = news.groupby(news['date'].dt.to_period('M')).size().reset_index()
+    news_monthly.columns = ['month', 'count']
+    news_monthly['month'] = news_monthly['month'].dt.to_timestamp()
+
+    fig = px.line(
+        news_monthly,
+        x='month',
+        y='count',
+        markers=True,
+        render_mode=charts.render_mode(len(news_monthly)),
+        labels={'count': 'Number of Headlines', 'month': 'Month'}
+    )
+    fig.update_traces(line_color='#EE4B2B', line_width=3)
+    fig.update_layout(height=400, template='plotly_white')
+    return fig
+
+
+# Risk metrics
+def rolling_var(dates, var, window):
+    fig = go.Figure()
+    fig.add_trace(charts.line(
+        dates, var * 100,
+        name=f'{window}-Day VaR',
+        line=dict(color='#A23E48', width=2),
+        fill='tozeroy',
+        fillcolor='rgba(162, 62, 72, 0.2)'
+    ))
+
+    fig.update_layout(
+        height=400,
+        template='plotly_white',
+        xaxis_title='Date',
+        yaxis_title='VaR (%)',
+        hovermode='x unified'
+    )
+    return fig
+
+
+def return_distribution(returns, var_95, var_99):
+    fig = go.Figure()
+
+    fig.add_trace(go.Histogram(
+        x=returns * 100,
+        nbinsx=50,
+        name='Returns',
+        marker_color='#2E86AB',
+        opacity=0.7
+    ))
+
+    fig.add_vline(
+        x=var_95 * 100,
+        line_dash="dash",
+        line_color="red",
+        annotation_text=f"VaR 95%: {var_95:.2%}",
+        annotation_position="top"
+    )
+
+    fig.add_vline(
+        x=var_99 * 100,
+        line_dash="dash",
+        line_color="darkred",
+        annotation_text=f"VaR 99%: {var_99:.2%}",
+        annotation_position="bottom"
+    )
+
+    fig.update_layout(
+        height=400,
+        template='plotly_white',
+        xaxis_title='Daily Return (%)',
+        yaxis_title='Frequency'
+    )
+    return fig
+
+
+def correlation_heatmap(df, features):
+    fig = px.imshow(
+        df[list(features)].corr(),
+        text_auto='.2f',
+        color_continuous_scale='RdBu_r',
+        aspect='auto',
+        labels={'color': 'Correlation'}
+    )
+    fig.update_layout(height=400, template='plotly_white')
+    return fig
+
+
+# Cross-pair comparison
+def normalized_prices(normalized):
+    fig = go.Figure()
+    for symbol in normalized.columns:
+        series = normalized[symbol].dropna()
+        fig.add_trace(charts.line(
+            series.index, series.to_numpy(),
+            name=symbol,
+            hovertemplate=f'<b>{symbol}</b> %{{y:.1f}}<extra></extra>'
+        ))
+    fig.add_hline(y=100, line_dash="dash", line_color="gray")
+    fig.update_layout(
+        height=500,
+        hovermode='x unified',
+        template='plotly_white',
+        xaxis_title='Date',
+        yaxis_title='Close (rebased to 100)'
+    )
+    return fig
+
+
+# Insights
+def crisis_gauge(crisis_pct):
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number",
+        value = crisis_pct,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': "Crisis Days %"},
+        gauge = {
+            'axis': {'range': [None, 30]},
+            'bar': {'color': "#EE4B2B"},
+            'steps': [
+                {'range': [0, 5], 'color': "#90EE90"},
+                {'range': [5, 10], 'color': "#FFD700"},
+                {'range': [10, 15], 'color': "#FFA500"},
+                {'range': [15, 30], 'color': "#FF6B6B"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 15
+            }
+        }
+    ))
+    fig.update_layout(height=300)
+    return fig
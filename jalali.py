@@ -0,0 +1,126 @@
+"""
+Vectorized Jalali (Persian solar hijri) calendar conversion
+Dates are mapped through a day number with the 33-year arithmetic cycle
+(8 leap years per cycle), using whole-array NumPy integer operations only,
+so converting millions of rows needs no per-row Python loop
+"""
+
+import numpy as np
+import pandas as pd
+
+MONTH_NAMES = ['Farvardin', 'Ordibehesht', 'Khordad', 'Tir', 'Mordad', 'Shahrivar',
+               'Mehr', 'Aban', 'Azar', 'Dey', 'Bahman', 'Esfand']
+
+# Day number of 1970-01-01 on the scale used below
+_EPOCH = 1075195
+_CYCLE_DAYS = 12053  # 33 years
+_BLOCK_DAYS = 1461   # 4 years, the first one leap
+_YEAR_OFFSET = 1595
+
+
+def _day_numbers(dates):
+    """Days since 1970-01-01 of datetime-like values, shifted to the cycle scale"""
+    dates = np.asarray(dates)
+    if dates.dtype.kind != 'M':
+        dates = np.asarray(pd.to_datetime(dates))
+    return dates.astype('datetime64[D]').astype(np.int64) + _EPOCH
+
+
+def from_gregorian(dates):
+    """Jalali (year, month, day) integer arrays for datetime-like values"""
+    days = _day_numbers(dates)
+    cycles, days = np.divmod(days, _CYCLE_DAYS)
+    blocks, days = np.divmod(days, _BLOCK_DAYS)
+    # After the leap first year of a block, years are 365 days long
+    later = days > 365
+    years = np.where(later, (days - 1) // 365, 0)
+    days = np.where(later, (days - 1) % 365, days)
+
+    year = 33 * cycles + 4 * blocks + years - _YEAR_OFFSET
+    first_half = days < 186
+    month = np.where(first_half, days // 31 + 1, (days - 186) // 30 + 7)
+    day = np.where(first_half, days % 31 + 1, (days - 186) % 30 + 1)
+    return year, month, day
+
+
+def to_gregorian(year, month, day):
+    """datetime64[D] array for Jalali year/month/day arrays"""
+    year = np.asarray(year, dtype=np.int64) + _YEAR_OFFSET
+    month = np.asarray(month, dtype=np.int64)
+    day = np.asarray(day, dtype=np.int64)
+
+    cycles, year = np.divmod(year, 33)
+    blocks, years = np.divmod(year, 4)
+    year_start = np.where(years > 0, 366 + 365 * (years - 1), 0)
+    day_of_year = np.where(month <= 6, (month - 1) * 31, 186 + (month - 7) * 30) + day - 1
+
+    days = cycles * _CYCLE_DAYS + blocks * _BLOCK_DAYS + year_start + day_of_year
+    return (days - _EPOCH).astype('datetime64[D]')
+
+
+def is_leap(year):
+    """True for Jalali leap years (30-day Esfand)"""
+    # The first year of each 4-year block is leap, except the cycle's
+    # 33rd year, which only has the 365 days left after 8 blocks
+    cycle_year = (np.asarray(year, dtype=np.int64) + _YEAR_OFFSET) % 33
+    return (cycle_year % 4 == 0) & (cycle_year != 32)
+
+
+def parse(values):
+    """Split 'YYYY/MM/DD' strings (or yyyymmdd integers) into year, month, day arrays"""
+    values = pd.Series(values)
+    if values.dtype.kind in 'iuf':
+        keys = values.to_numpy(dtype=np.int64)
+    else:
+        keys = pd.to_numeric(values.astype(str).str.replace('/', ''), errors='coerce').to_numpy(dtype=np.int64)
+    return keys // 10000, keys // 100 % 100, keys % 100
+
+
+def date_key(year, month, day):
+    """yyyymmdd integer key (the format of the price frame's date_persian)"""
+    return np.asarray(year) * 10000 + np.asarray(month) * 100 + np.asarray(day)
+
+
+def format_date(date):
+    """'YYYY/MM/DD' Jalali string for a single date"""
+    year, month, day = from_gregorian([date])
+    return f"{year[0]:04d}/{month[0]:02d}/{day[0]:02d}"
+
+
+if __name__ == '__main__':
+    import time
+
+    import data_cache
+    import metrics
+
+    # Verify against the dataset's own Persian Date column
+    raw = pd.read_csv(data_cache.EXCHANGE_RATE_FILE)
+    gregorian = pd.to_datetime(raw['Gregorian Date'])
+    expected = date_key(*parse(raw['Persian Date']))
+    converted = date_key(*from_gregorian(gregorian))
+    mismatches = int((converted != expected).sum())
+    round_trip = int((to_gregorian(*parse(raw['Persian Date'])) != gregorian.to_numpy(dtype='datetime64[D]')).sum())
+    print(f"Persian Date column: {len(raw):,} rows, {mismatches} mismatches, "
+          f"{round_trip} round-trip errors")
+
+    frame = metrics.build_price_frame(data_cache.EXCHANGE_RATE_FILE)
+    key_months = frame['date_persian'].to_numpy() // 100
+    frame_months = frame['jalali_year'].to_numpy(dtype=np.int64) * 100 + frame['jalali_month']
+    print(f"Price frame: {int((frame_months != key_months).sum())} jalali_year/month mismatches")
+
+    # is_leap must agree with the year lengths of the conversion
+    years = np.arange(1000, 2000)
+    lengths = (to_gregorian(years + 1, 1, 1) - to_gregorian(years, 1, 1)).astype(np.int64)
+    print(f"Leap years 1000-1999: {int(((lengths == 366) != is_leap(years)).sum())} is_leap mismatches")
+
+    # Speed on a large array
+    dates = np.arange('1900-01-01', '2100-01-01', dtype='datetime64[D]')
+    dates = np.tile(dates, 30)
+    start = time.perf_counter()
+    parts = from_gregorian(dates)
+    middle = time.perf_counter()
+    back = to_gregorian(*parts)
+    end = time.perf_counter()
+    assert (back == dates).all()
+    print(f"{len(dates):,} dates: to Jalali {(middle - start) * 1000:.0f} ms, "
+          f"back {(end - middle) * 1000:.0f} ms")
@@ -0,0 +1,90 @@
+"""
+Small thread-safe LRU memo cache
+Used for derived results that are cheap to key but costly to rebuild
+(range metrics, rolling windows, figures) and shared across Streamlit
+reruns; entries are evicted by count and, optionally, by a byte budget
+"""
+
+from collections import OrderedDict
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+def sizeof(value):
+    """Approximate memory held by a cached value, in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, max_entries=32, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _over_budget(self):
+        if len(self._data) > self.max_entries:
+            return True
+        # The newest entry is kept even if it alone exceeds the budget
+        return self.max_bytes is not None and self.nbytes > self.max_bytes and len(self._data) > 1
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self.nbytes -= self._sizes[key]
+            self._data[key] = value
+            self._sizes[key] = size
+            self.nbytes += size
+            self._data.move_to_end(key)
+            while self._over_budget():
+                old_key, _ = self._data.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.nbytes = 0
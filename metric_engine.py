@@ -0,0 +1,96 @@
+"""
+Incremental metric engine
+Keeps the running peak, last close and rolling-window tails so that new
+rows can be derived in O(new rows) instead of recomputing the full history
+"""
+
+from collections import deque
+import math
+
+import numpy as np
+import pandas as pd
+
+from metrics import DRAWDOWN_CRISIS_THRESHOLD, RET_CRISIS_THRESHOLD, ROLLING_WINDOWS
+
+
+class MetricEngine:
+    """Stateful calculator for the derived price columns"""
+
+    def __init__(self, windows=ROLLING_WINDOWS):
+        self.windows = tuple(windows)
+        size = max(self.windows)
+        self.last_close = math.nan
+        self.running_peak = math.nan
+        self.closes = deque(maxlen=size)
+        self.returns = deque(maxlen=size)
+
+    @classmethod
+    def from_frame(cls, df, windows=ROLLING_WINDOWS):
+        """Seed the engine from the tail of an already derived frame"""
+        engine = cls(windows)
+        if len(df) == 0:
+            return engine
+
+        tail = df.iloc[-max(engine.windows):]
+        engine.closes.extend(tail['close_price'].astype(float))
+        engine.returns.extend(tail['ret_close_close'].astype(float))
+        engine.last_close = float(df['close_price'].iloc[-1])
+        engine.running_peak = float(df['close_price'].max())
+        return engine
+
+    def _window_stats(self, values, window):
+        if len(values) < window:
+            return math.nan, math.nan
+        tail = np.fromiter(values, dtype=float)[-window:]
+        return tail.mean(), tail.std(ddof=1)
+
+    def update(self, close):
+        """Consume one close price and return its derived metrics"""
+        close = float(close)
+
+        if math.isnan(close) or math.isnan(self.last_close):
+            ret = math.nan
+        else:
+            ret = close / self.last_close - 1.0
+
+        if math.isnan(close):
+            peak = math.nan
+            drawdown = math.nan
+        else:
+            if math.isnan(self.running_peak) or close > self.running_peak:
+                self.running_peak = close
+            peak = self.running_peak
+            drawdown = close / peak - 1.0
+
+        self.last_close = close
+        self.closes.append(close)
+        self.returns.append(ret)
+
+        row = {
+            'ret_close_close': ret,
+            'running_peak': peak,
+            'drawdown': drawdown,
+        }
+        for window in self.windows:
+            row[f'ma_{window}d'] = self._window_stats(self.closes, window)[0]
+            row[f'vol_{window}d'] = self._window_stats(self.returns, window)[1]
+        row['is_crisis'] = int(
+            ret < RET_CRISIS_THRESHOLD or drawdown <= DRAWDOWN_CRISIS_THRESHOLD
+        )
+        return row
+
+    def append(self, new_rows):
+        """
+        Derive metrics for rows that follow the engine's history
+        new_rows must be sorted by date and carry the cleaned price columns
+        """
+        new_rows = new_rows.copy()
+        derived = pd.DataFrame(
+            [self.update(close) for close in new_rows['close_price']],
+            index=new_rows.index
+        )
+        for col in derived.columns:
+            new_rows[col] = derived[col]
+
+        new_rows["vol_intraday"] = (new_rows["high_price"] - new_rows["low_price"]) / new_rows["open_price"]
+        return new_rows
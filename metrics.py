@@ -0,0 +1,252 @@
+"""
+Shared metrics pipeline for the exchange rate dataset
+Used by both the dashboard and the auto-updater; deliberately free of
+Streamlit so it imports quickly from cron
+"""
+
+import calendar
+
+import numpy as np
+import pandas as pd
+
+import jalali
+import validation
+
+# Raw CSV header -> column name used everywhere else
+COLUMN_MAP = {
+    "Open Price": "open_price",
+    "Low Price": "low_price",
+    "High Price": "high_price",
+    "Close Price": "close_price",
+    "Change Amount": "change_amount",
+    "Change Percent": "change_percent",
+    "Gregorian Date": "date_gregorian",
+    "Persian Date": "date_persian"
+}
+
+# Crisis rule: a sharp daily drop or a deep drawdown from the running peak
+RET_CRISIS_THRESHOLD = -0.05
+DRAWDOWN_CRISIS_THRESHOLD = -0.20
+
+# Alternative rule from analysis.sql: the worst 5% of days within each year
+CRISIS_PERCENTILE = 0.05
+CRISIS_MODES = {
+    'fixed': 'Fixed thresholds (-5% return / -20% drawdown)',
+    'percentile': 'Yearly 5th percentile',
+}
+
+ROLLING_WINDOWS = (7, 30)
+
+# Ordered month names; month_name is stored as this categorical
+MONTH_NAME_DTYPE = pd.CategoricalDtype(list(calendar.month_name[1:]), ordered=True)
+
+# Compact in-memory schema of the derived price frame. Rial prices fit in
+# int32 and the Persian date is a yyyymmdd integer. Returns, drawdown and
+# intraday volatility stay float64 because the crisis rule compares them
+# against thresholds and they are exported as-is
+PRICE_SCHEMA = {
+    'open_price': 'int32',
+    'low_price': 'int32',
+    'high_price': 'int32',
+    'close_price': 'int32',
+    'change_amount': 'float32',
+    'change_percent': 'float32',
+    'date_persian': 'uint32',
+    'ret_close_close': 'float64',
+    'vol_intraday': 'float64',
+    'running_peak': 'int32',
+    'drawdown': 'float64',
+    **{f'vol_{window}d': 'float32' for window in ROLLING_WINDOWS},
+    **{f'ma_{window}d': 'float32' for window in ROLLING_WINDOWS},
+    'is_crisis': 'int8',
+    'year': 'uint16',
+    'month': 'uint8',
+    'quarter': 'uint8',
+    'month_name': MONTH_NAME_DTYPE,
+    'jalali_year': 'uint16',
+    'jalali_month': 'uint8',
+    'jalali_quarter': 'uint8',
+}
+
+# Columns written to crisis_dates.csv
+CRISIS_EXPORT_COLUMNS = ['date_gregorian', 'close_price', 'ret_close_close',
+                         'drawdown', 'vol_intraday', 'is_crisis']
+
+
+def clean_price_frame(df):
+    """Rename raw columns, parse dates and numbers, and sort by date"""
+    df = df.rename(columns=COLUMN_MAP)
+
+    # Convert date
+    df["date_gregorian"] = pd.to_datetime(df["date_gregorian"], format="%Y/%m/%d", errors="coerce")
+
+    # Unparseable prices become NaN; validation quarantines those rows
+    for col in validation.PRICE_COLUMNS:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col].astype(str).str.replace(",", ""), errors="coerce")
+
+    # Clean numeric columns
+    df["change_amount"] = pd.to_numeric(
+        df["change_amount"].astype(str).str.replace(",", ""),
+        errors="coerce"
+    )
+    df["change_percent"] = pd.to_numeric(
+        df["change_percent"].astype(str).str.replace("%","").str.replace(",","."),
+        errors="coerce"
+    ) / 100.0
+
+    # Persian date as a yyyymmdd integer (1404/07/03 -> 14040703)
+    df["date_persian"] = pd.to_numeric(
+        df["date_persian"].astype(str).str.replace("/", ""),
+        errors="coerce"
+    ).fillna(0)
+
+    # Sort by date
+    return apply_schema(df.sort_values('date_gregorian').reset_index(drop=True))
+
+
+def _fits(values, dtype):
+    """Whether values can be cast to an integer dtype without loss (other casts always apply)"""
+    if not pd.api.types.is_integer_dtype(dtype) or len(values) == 0:
+        return True
+    if pd.api.types.is_float_dtype(values.dtype):
+        array = values.to_numpy()
+        if np.isnan(array).any() or (array != np.round(array)).any():
+            return False
+    elif not pd.api.types.is_integer_dtype(values.dtype):
+        return False
+    info = np.iinfo(dtype)
+    return info.min <= values.min() and values.max() <= info.max
+
+
+def apply_schema(df, schema=PRICE_SCHEMA):
+    """
+    Cast the columns present in df to the compact schema
+    Integer columns too wide for their declared type (e.g. a series priced
+    above the int32 range) keep their dtype
+    """
+    return df.astype({col: dtype for col, dtype in schema.items()
+                      if col in df.columns and _fits(df[col], dtype)})
+
+
+def source_lines(csv_path, rows):
+    """(line number, text) in the file of data rows at the given positions"""
+    with open(csv_path, encoding='utf-8') as f:
+        # read_csv skips blank lines; the first non-blank line is the header
+        records = [(number, line.rstrip('\r\n')) for number, line in enumerate(f, 1) if line.strip()][1:]
+    return [records[row] for row in rows]
+
+
+def check_price_csv(csv_path):
+    """
+    Read, clean and validate the raw CSV (valid rows, quarantined rows, report)
+    Quarantined rows carry their line number and text in the CSV
+    """
+    raw = pd.read_csv(csv_path)
+    result = validation.validate(clean_price_frame(raw.assign(source_row=np.arange(len(raw)))))
+    flagged = result.quarantined
+    lines = source_lines(csv_path, flagged['source_row']) if len(flagged) else []
+    quarantined = pd.DataFrame({
+        'line': [number for number, _ in lines],
+        'record': [text for _, text in lines],
+        'violations': flagged['violations'].to_numpy(),
+    }).sort_values('line', ignore_index=True)
+    return result._replace(valid=apply_schema(result.valid.drop(columns='source_row')), quarantined=quarantined)
+
+
+def read_price_csv(csv_path):
+    """Read and clean the raw exchange rate CSV, leaving out quarantined rows"""
+    return check_price_csv(csv_path).valid
+
+
+def crisis_flag(ret_close_close, drawdown):
+    """Vectorized crisis rule, returned as 0/1 integers"""
+    return (
+        (ret_close_close < RET_CRISIS_THRESHOLD) |
+        (drawdown <= DRAWDOWN_CRISIS_THRESHOLD)
+    ).astype(PRICE_SCHEMA['is_crisis'])
+
+
+def yearly_thresholds(df, q=CRISIS_PERCENTILE):
+    """Per-year q-quantiles of return and drawdown (PERCENTILE_CONT semantics)"""
+    thresholds = df.groupby('year')[['ret_close_close', 'drawdown']].quantile(q)
+    return thresholds.rename(columns={
+        'ret_close_close': 'ret_threshold',
+        'drawdown': 'dd_threshold'
+    })
+
+
+def percentile_crisis_flag(df, q=CRISIS_PERCENTILE):
+    """
+    Flag days at or below their year's q-quantile of return or drawdown
+    Thresholds are computed once per year and broadcast back by position
+    """
+    thresholds = yearly_thresholds(df, q)
+    pos = thresholds.index.get_indexer(df['year'])
+    ret_threshold = thresholds['ret_threshold'].to_numpy()[pos]
+    dd_threshold = thresholds['dd_threshold'].to_numpy()[pos]
+    return pd.Series(
+        ((df['ret_close_close'].to_numpy() <= ret_threshold) |
+         (df['drawdown'].to_numpy() <= dd_threshold)).astype(PRICE_SCHEMA['is_crisis']),
+        index=df.index
+    )
+
+
+def apply_crisis_mode(df, mode='fixed', q=CRISIS_PERCENTILE):
+    """Return a copy of df with is_crisis recomputed under the given rule"""
+    if mode not in CRISIS_MODES:
+        raise ValueError(f"Unknown crisis mode: {mode}")
+
+    df = df.copy()
+    if mode == 'percentile':
+        df['is_crisis'] = percentile_crisis_flag(df, q)
+    else:
+        df['is_crisis'] = crisis_flag(df['ret_close_close'], df['drawdown'])
+    return df
+
+
+def add_time_features(df):
+    """Add calendar columns used for grouping (month names via lookup, not strftime)"""
+    dates = df['date_gregorian'].dt
+    df['year'] = dates.year.astype(PRICE_SCHEMA['year'])
+    df['month'] = dates.month.astype(PRICE_SCHEMA['month'])
+    df['quarter'] = dates.quarter.astype(PRICE_SCHEMA['quarter'])
+    df['month_name'] = pd.Categorical.from_codes(df['month'].to_numpy().astype('int8') - 1,
+                                                 dtype=MONTH_NAME_DTYPE)
+
+    # Persian (Jalali) calendar; quarters are its seasons
+    year, month, _ = jalali.from_gregorian(df['date_gregorian'])
+    df['jalali_year'] = year.astype(PRICE_SCHEMA['jalali_year'])
+    df['jalali_month'] = month.astype(PRICE_SCHEMA['jalali_month'])
+    df['jalali_quarter'] = ((month - 1) // 3 + 1).astype(PRICE_SCHEMA['jalali_quarter'])
+    return df
+
+
+def compute_metrics(df):
+    """Derive every risk, rolling and calendar column in one pass"""
+    close = df["close_price"]
+
+    # Calculate risk metrics
+    df["ret_close_close"] = close.pct_change()
+    df["vol_intraday"] = (df["high_price"] - df["low_price"]) / df["open_price"]
+    df["running_peak"] = close.cummax()
+    df["drawdown"] = close / df["running_peak"] - 1.0
+    for window in ROLLING_WINDOWS:
+        df[f"vol_{window}d"] = df["ret_close_close"].rolling(window=window).std()
+    for window in ROLLING_WINDOWS:
+        df[f"ma_{window}d"] = close.rolling(window=window).mean()
+
+    # Crisis detection
+    df["is_crisis"] = crisis_flag(df["ret_close_close"], df["drawdown"])
+
+    return apply_schema(add_time_features(df))
+
+
+def build_price_frame(csv_path):
+    """Parse the raw CSV and derive all dashboard columns"""
+    return compute_metrics(read_price_csv(csv_path))
+
+
+def crisis_days(df):
+    """Rows flagged as crisis days, in the crisis_dates.csv layout"""
+    return df.loc[df["is_crisis"] == 1, CRISIS_EXPORT_COLUMNS]
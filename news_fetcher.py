@@ -0,0 +1,264 @@
+"""
+Concurrent GDELT news fetcher
+Queries the GDELT Doc API for many crisis days at once over a pooled
+HTTP session, with a token-bucket rate limit and retry with backoff
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import atomic_io
+
+# Configuration (GDELT_API_URL can point at a local stub server)
+GDELT_API_URL = os.environ.get('GDELT_API_URL', 'https://api.gdeltproject.org/api/v2/doc/doc')
+NEWS_QUERY = "Iran currency exchange rate dollar sanctions"
+MAX_RECORDS = 10
+
+MAX_IN_FLIGHT = 8
+REQUESTS_PER_SECOND = 4.0
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+TIMEOUT_SECONDS = 10
+
+# Response cache: past days never change, today's results are refreshed
+CACHE_DIR = Path(__file__).parent / '.cache' / 'gdelt'
+TODAY_TTL_SECONDS = 3600
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Responses worth retrying: rate limited or transient server errors
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is free"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of raw GDELT responses
+    Entries are keyed on the query parameters; file mtimes track recency
+    so the least recently used entries are evicted past max_bytes
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._size = None
+
+    def _path(self, url, params):
+        key = json.dumps([url, sorted(params.items())], default=str)
+        return self.directory / f'{hashlib.sha256(key.encode()).hexdigest()}.json'
+
+    def _entries(self):
+        return [p for p in self.directory.glob('*.json') if p.is_file()]
+
+    def get(self, url, params):
+        path = self._path(url, params)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        expires = entry.get('expires')
+        if expires is not None and expires < time.time():
+            return None
+
+        # Touch the entry so eviction treats it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry['data']
+
+    def put(self, url, params, data, ttl=None):
+        path = self._path(url, params)
+        entry = {
+            'expires': None if ttl is None else time.time() + ttl,
+            'data': data,
+        }
+        payload = json.dumps(entry).encode()
+
+        with self.lock:
+            # An overwritten entry's bytes leave the budget
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            with atomic_io.atomic_write(path, 'wb') as f:
+                f.write(payload)
+
+            if self._size is None:
+                self._size = sum(p.stat().st_size for p in self._entries())
+            else:
+                self._size += len(payload) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries down to 90% of the budget"""
+        entries = []
+        for p in self._entries():
+            try:
+                stat = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, p))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._size = total
+
+
+def build_params(date):
+    """GDELT query parameters for a single day"""
+    date_str = date.strftime("%Y%m%d")
+    return {
+        "query": NEWS_QUERY,
+        "mode": "ArtList",
+        "format": "json",
+        "maxrecords": MAX_RECORDS,
+        "sort": "DateDesc",
+        "startdatetime": f"{date_str}000000",
+        "enddatetime": f"{date_str}235959",
+    }
+
+
+def parse_articles(data, date):
+    """Turn a GDELT ArtList response into headline rows"""
+    headlines = []
+    for art in data.get("articles", []):
+        title = art.get("title", "")
+        # Filter English headlines
+        if any(c.isascii() and c.isalpha() for c in title):
+            headlines.append({
+                "date": date,
+                "title": title,
+                "url": art.get("url"),
+                "source": art.get("domain")
+            })
+    return headlines
+
+
+class GdeltClient:
+    """Pooled, rate-limited GDELT client"""
+
+    def __init__(self, base_url=GDELT_API_URL, max_in_flight=MAX_IN_FLIGHT,
+                 requests_per_second=REQUESTS_PER_SECOND, max_retries=MAX_RETRIES,
+                 backoff=BACKOFF_SECONDS, timeout=TIMEOUT_SECONDS, cache=None):
+        self.base_url = base_url
+        self.cache = cache
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.bucket = TokenBucket(requests_per_second)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_json(self, params, ttl=None):
+        """
+        GET with rate limiting and exponential backoff on transient errors
+        Served from the response cache when one is configured
+        """
+        if self.cache is not None:
+            data = self.cache.get(self.base_url, params)
+            if data is not None:
+                return data
+
+        data = self._request(params)
+        if self.cache is not None:
+            self.cache.put(self.base_url, params, data, ttl=ttl)
+        return data
+
+    def _request(self, params):
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                resp = self.session.get(self.base_url, params=params, timeout=self.timeout)
+                if resp.status_code == 200:
+                    return resp.json()
+                if resp.status_code not in RETRY_STATUS:
+                    resp.raise_for_status()
+                    raise requests.HTTPError(f"Unexpected status {resp.status_code}")
+                error = requests.HTTPError(f"HTTP {resp.status_code}")
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            if attempt < self.max_retries:
+                time.sleep(self.backoff * (2 ** attempt))
+        raise error
+
+    def fetch_day(self, date):
+        """Headlines for one day"""
+        # Historical days are final; today's articles are still arriving
+        ttl = TODAY_TTL_SECONDS if date.date() >= datetime.now().date() else None
+        return parse_articles(self.get_json(build_params(date), ttl=ttl), date)
+
+    def fetch_days(self, dates):
+        """
+        Fetch several days concurrently
+        Returns (headlines, errors) where errors maps date -> exception
+        """
+        headlines, errors = [], {}
+        if not dates:
+            return headlines, errors
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            futures = {date: pool.submit(self.fetch_day, date) for date in dates}
+            for date, future in futures.items():
+                try:
+                    headlines.extend(future.result())
+                except Exception as e:
+                    errors[date] = e
+        return headlines, errors
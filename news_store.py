@@ -0,0 +1,93 @@
+"""
+Date-indexed store for crisis-day news headlines
+Keeps headlines sorted by day so lookups by date or date range are binary
+searches over a datetime64 array instead of full-frame scans
+"""
+
+import numpy as np
+import pandas as pd
+
+import atomic_io
+
+NEWS_COLUMNS = ['date', 'title', 'url', 'source']
+
+
+def _to_day(value):
+    return np.datetime64(pd.Timestamp(value).normalize(), 'ns')
+
+
+class NewsStore:
+    """Headlines sorted by date with O(log n) date and range lookups"""
+
+    def __init__(self, frame=None):
+        if frame is None:
+            frame = pd.DataFrame(columns=NEWS_COLUMNS)
+        frame = frame.copy()
+        frame['date'] = pd.to_datetime(frame['date'])
+        self._set_frame(frame)
+
+    def _set_frame(self, frame):
+        days = frame['date'].dt.normalize()
+        order = np.argsort(days.to_numpy(), kind='stable')
+        self.frame = frame.iloc[order].reset_index(drop=True)
+        self._days = days.to_numpy(dtype='datetime64[ns]')[order]
+
+    @classmethod
+    def from_csv(cls, path):
+        """Load a headline CSV, or an empty store if it does not exist yet"""
+        try:
+            return cls(pd.read_csv(path))
+        except FileNotFoundError:
+            return cls()
+
+    def to_csv(self, path, snapshot_copy=False):
+        """Atomically rewrite the headline CSV"""
+        return atomic_io.write_csv(self.frame, path, snapshot_copy, index=False)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _bounds(self, start, end):
+        lo = np.searchsorted(self._days, _to_day(start), side='left')
+        hi = np.searchsorted(self._days, _to_day(end), side='right')
+        return lo, hi
+
+    def between(self, start, end):
+        """Headlines dated start..end inclusive (a view, not a copy)"""
+        lo, hi = self._bounds(start, end)
+        return self.frame.iloc[lo:hi]
+
+    def on_date(self, date):
+        """Headlines for a single day"""
+        return self.between(date, date)
+
+    def has_date(self, date):
+        lo, hi = self._bounds(date, date)
+        return hi > lo
+
+    def missing_dates(self, dates):
+        """The subset of dates that have no headlines yet"""
+        if len(dates) == 0:
+            return []
+        if len(self._days) == 0:
+            return list(dates)
+        days = pd.DatetimeIndex(dates).normalize().to_numpy(dtype='datetime64[ns]')
+        pos = np.searchsorted(self._days, days)
+        found = (pos < len(self._days)) & (self._days[np.minimum(pos, len(self._days) - 1)] == days)
+        return [d for d, hit in zip(dates, found) if not hit]
+
+    def upsert(self, rows):
+        """
+        Add a batch of headline rows, skipping (date, title) duplicates
+        Returns the number of rows actually added
+        """
+        new = pd.DataFrame(rows, columns=NEWS_COLUMNS)
+        if len(new) == 0:
+            return 0
+        new['date'] = pd.to_datetime(new['date'])
+
+        merged = pd.concat([self.frame.assign(_new=False), new.assign(_new=True)], ignore_index=True)
+        merged = merged.drop_duplicates(subset=['date', 'title'], keep='first')
+        added = int(merged['_new'].sum())
+        self._set_frame(merged.drop(columns='_new'))
+        return added
@@ -0,0 +1,51 @@
+"""
+Binary-search date-range selection over the sorted price frame
+Ranges resolve to positional bounds with searchsorted, rows are returned
+as iloc slices, and crisis counts come from a prefix-sum array in O(1)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class DateRangeIndex:
+    """Positional index over a date-sorted frame"""
+
+    def __init__(self, df):
+        self.df = df
+        self.dates = df['date_gregorian'].to_numpy(dtype='datetime64[ns]')
+        self.crisis_prefix = np.concatenate(([0], np.cumsum(df['is_crisis'].to_numpy(dtype=np.int64))))
+        self.crisis_rows = df[df['is_crisis'] == 1]
+
+    def bounds(self, start, end):
+        """Positions [lo, hi) of the rows dated start..end inclusive"""
+        start = np.datetime64(pd.Timestamp(start).normalize(), 'ns')
+        end = np.datetime64(pd.Timestamp(end).normalize() + pd.Timedelta(days=1), 'ns')
+        lo = int(np.searchsorted(self.dates, start, side='left'))
+        hi = int(np.searchsorted(self.dates, end, side='left'))
+        return lo, max(lo, hi)
+
+    def select(self, start, end):
+        """Rows dated start..end inclusive, as a positional slice"""
+        lo, hi = self.bounds(start, end)
+        return self.df.iloc[lo:hi]
+
+    def select_crisis(self, start, end):
+        """Crisis rows dated start..end inclusive"""
+        lo, hi = self.bounds(start, end)
+        return self.crisis_rows.iloc[self.crisis_prefix[lo]:self.crisis_prefix[hi]]
+
+    def count(self, start, end):
+        lo, hi = self.bounds(start, end)
+        return hi - lo
+
+    def crisis_count(self, start, end):
+        lo, hi = self.bounds(start, end)
+        return int(self.crisis_prefix[hi] - self.crisis_prefix[lo])
+
+    def span_days(self, start, end):
+        """Days between the first and last row in the range"""
+        lo, hi = self.bounds(start, end)
+        if hi <= lo:
+            return 0
+        return int((self.dates[hi - 1] - self.dates[lo]) // np.timedelta64(1, 'D'))
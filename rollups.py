@@ -0,0 +1,172 @@
+"""
+Pre-aggregated calendar rollups of the price frame
+Monthly sums and counts are built once per dataset version and calendar
+(Gregorian or Persian); any date range is answered by combining the whole
+months inside it with the (at most two) partial months at its edges, so
+pages never regroup the daily frame
+"""
+
+from calendar import month_name
+
+import numpy as np
+import pandas as pd
+
+import jalali
+
+# Calendars the rollups can be grouped by
+CALENDARS = {
+    'gregorian': 'Gregorian',
+    'jalali': 'Persian (Jalali)',
+}
+
+# Year/quarter/month columns of the price frame per calendar
+CALENDAR_COLUMNS = {
+    'gregorian': ('year', 'quarter', 'month'),
+    'jalali': ('jalali_year', 'jalali_quarter', 'jalali_month'),
+}
+
+MONTH_NAMES = {
+    'gregorian': list(month_name[1:]),
+    'jalali': jalali.MONTH_NAMES,
+}
+
+# Additive measures kept per month; means are derived as sum / count
+MEASURES = ['total_days', 'crisis_days',
+            'ret_sum', 'ret_n', 'crisis_ret_sum', 'crisis_ret_n',
+            'close_sum', 'close_n',
+            'vol_sum', 'vol_n', 'crisis_vol_sum', 'crisis_vol_n']
+
+
+def month_bounds(year, month, calendar='gregorian'):
+    """First day of each month and of the following month, as datetime64[ns]"""
+    year = np.asarray(year, dtype=np.int64)
+    month = np.asarray(month, dtype=np.int64)
+    next_year, next_month = year + month // 12, month % 12 + 1
+    if calendar == 'jalali':
+        start = jalali.to_gregorian(year, month, 1)
+        end = jalali.to_gregorian(next_year, next_month, 1)
+    else:
+        start = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+        end = ((next_year - 1970) * 12 + next_month - 1).astype('datetime64[M]')
+    return start.astype('datetime64[ns]'), end.astype('datetime64[ns]')
+
+
+def period_sums(df, calendar='gregorian'):
+    """Monthly sums/counts of the additive measures for a slice of rows"""
+    year, quarter, month = CALENDAR_COLUMNS[calendar]
+    ret = df['ret_close_close']
+    close = df['close_price']
+    vol = df['vol_intraday']
+    crisis = df['is_crisis'] == 1
+
+    parts = pd.DataFrame({
+        'year': df[year],
+        'quarter': df[quarter],
+        'month': df[month],
+        'total_days': 1,
+        'crisis_days': df['is_crisis'].astype(int),
+        'ret_sum': ret.fillna(0.0),
+        'ret_n': ret.notna().astype(int),
+        'crisis_ret_sum': ret.where(crisis, 0.0).fillna(0.0),
+        'crisis_ret_n': (ret.notna() & crisis).astype(int),
+        'close_sum': close.fillna(0).astype(float),
+        'close_n': close.notna().astype(int),
+        'vol_sum': vol.fillna(0.0),
+        'vol_n': vol.notna().astype(int),
+        'crisis_vol_sum': vol.where(crisis, 0.0).fillna(0.0),
+        'crisis_vol_n': (vol.notna() & crisis).astype(int),
+    })
+    monthly = parts.groupby(['year', 'quarter', 'month'], sort=True)[MEASURES].sum().reset_index()
+    monthly['period_start'], monthly['period_end'] = month_bounds(monthly['year'], monthly['month'], calendar)
+    return monthly
+
+
+class Rollups:
+    """Monthly rollup table plus helpers to answer date-range queries"""
+
+    def __init__(self, df, calendar='gregorian'):
+        self.calendar = calendar
+        self.dates = df['date_gregorian'].to_numpy(dtype='datetime64[ns]')
+        self.monthly = period_sums(df, calendar)
+        self._month_starts = self.monthly['period_start'].to_numpy(dtype='datetime64[ns]')
+        self._month_ends = self.monthly['period_end'].to_numpy(dtype='datetime64[ns]')
+
+    def for_range(self, df, start, end):
+        """
+        Monthly rollup rows covering start..end inclusive
+        df must be the frame the rollups were built from (sorted by date)
+        """
+        start = pd.Timestamp(start).normalize()
+        end = pd.Timestamp(end).normalize()
+        if start > end:
+            return self.monthly.iloc[:0]
+
+        # Whole months: the first starting on/after start up to the last
+        # ending by end (month bounds follow the rollup's calendar)
+        lo = np.searchsorted(self._month_starts, np.datetime64(start, 'ns'), side='left')
+        hi = np.searchsorted(self._month_ends, np.datetime64(end + pd.Timedelta(days=1), 'ns'), side='right')
+
+        if lo >= hi:
+            # Range lies within one or two partial months
+            return self._edge(df, start, end)
+
+        first_full = pd.Timestamp(self._month_starts[lo])
+        end_full = pd.Timestamp(self._month_ends[hi - 1])
+        pieces = [self._edge(df, start, first_full - pd.Timedelta(days=1)),
+                  self.monthly.iloc[lo:hi],
+                  self._edge(df, end_full, end)]
+        pieces = [p for p in pieces if len(p)]
+        if not pieces:
+            return self.monthly.iloc[:0]
+        return pd.concat(pieces, ignore_index=True)
+
+    def _edge(self, df, start, end):
+        """Aggregate the raw rows of a partial month"""
+        if start > end:
+            return self.monthly.iloc[:0]
+        lo = np.searchsorted(self.dates, np.datetime64(start, 'ns'), side='left')
+        hi = np.searchsorted(self.dates, np.datetime64(end + pd.Timedelta(days=1), 'ns'), side='left')
+        if hi <= lo:
+            return self.monthly.iloc[:0]
+        return period_sums(df.iloc[lo:hi], self.calendar)
+
+
+def _with_means(grouped):
+    grouped['crisis_pct'] = grouped['crisis_days'] / grouped['total_days'] * 100
+    grouped['avg_return'] = grouped['ret_sum'] / grouped['ret_n'].replace(0, np.nan)
+    grouped['avg_close'] = grouped['close_sum'] / grouped['close_n'].replace(0, np.nan)
+    return grouped
+
+
+def by_year(monthly):
+    """Per-year totals with crisis share and average close"""
+    return _with_means(monthly.groupby('year')[MEASURES].sum().reset_index())
+
+
+def by_quarter_of_year(monthly):
+    """Totals per calendar quarter (1-4) across all years"""
+    return _with_means(monthly.groupby('quarter')[MEASURES].sum().reset_index())
+
+
+def by_month_of_year(monthly, calendar='gregorian'):
+    """Totals per calendar month (1-12) across all years"""
+    grouped = _with_means(monthly.groupby('month')[MEASURES].sum().reset_index())
+    grouped['month_name'] = [MONTH_NAMES[calendar][m - 1] for m in grouped['month']]
+    return grouped
+
+
+def crisis_split(monthly):
+    """Average return and intraday volatility for crisis vs normal days"""
+    totals = monthly[MEASURES].sum()
+
+    def mean(total, count):
+        return total / count if count else np.nan
+
+    return {
+        'crisis_return': mean(totals['crisis_ret_sum'], totals['crisis_ret_n']),
+        'normal_return': mean(totals['ret_sum'] - totals['crisis_ret_sum'],
+                              totals['ret_n'] - totals['crisis_ret_n']),
+        'crisis_vol': mean(totals['crisis_vol_sum'], totals['crisis_vol_n']),
+        'normal_vol': mean(totals['vol_sum'] - totals['crisis_vol_sum'],
+                           totals['vol_n'] - totals['crisis_vol_n']),
+    }
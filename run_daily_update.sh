@@ -19,6 +19,5 @@ python3 auto_update.py
 echo "✅ Update completed at $(date)"
 echo "----------------------------------------"
 
-# Optional: Restart Streamlit (if running as a service)
-# pkill -f "streamlit run app.py"
-# nohup streamlit run app.py > streamlit.log 2>&1 &
+# No Streamlit restart needed: auto_update.py writes data_manifest.json and
+# running dashboards reload the changed datasets in the background
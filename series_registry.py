@@ -0,0 +1,166 @@
+"""
+Registry of the price series tracked by the dashboard
+Every series is a CSV in the Dollar_Rial_Price_Dataset layout and goes
+through the same cleaning/metric pipeline with its own Parquet cache.
+Series that need deriving are computed in parallel worker processes, and
+all series are stacked into one long frame keyed by symbol
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+
+import data_cache
+import metrics
+
+DATA_DIR = data_cache.DATA_DIR
+
+# symbol -> CSV; series whose file is missing are skipped
+SERIES = {
+    'USD/IRR': data_cache.EXCHANGE_RATE_FILE,
+    'EUR/IRR': DATA_DIR / 'Euro_Rial_Price_Dataset.csv',
+    'AED/IRR': DATA_DIR / 'Dirham_Rial_Price_Dataset.csv',
+    'GOLD_COIN': DATA_DIR / 'Gold_Coin_Price_Dataset.csv',
+}
+
+# The series behind the single-series pages (the manifest's 'prices')
+PRIMARY_SYMBOL = 'USD/IRR'
+
+# Worker processes for deriving series (0 = one per CPU)
+MAX_WORKERS = int(os.environ.get('DASHBOARD_SERIES_WORKERS', 0))
+
+# Stale CSV volume below which series are derived in-process: deriving
+# costs ~0.1 s/MB, while starting a worker and its imports costs ~0.7 s
+PARALLEL_MIN_MB = float(os.environ.get('DASHBOARD_SERIES_PARALLEL_MB', 16))
+
+
+def dataset_name(symbol):
+    """Name of a series in the data manifest"""
+    return 'prices' if symbol == PRIMARY_SYMBOL else f'series:{symbol}'
+
+
+def available_series(series=SERIES):
+    return {symbol: path for symbol, path in series.items() if os.path.exists(path)}
+
+
+def _derive(path):
+    # Runs in a worker process; also refreshes the series' Parquet cache
+    return data_cache.load_price_frame(path)
+
+
+def load_frames(series=SERIES, max_workers=MAX_WORKERS):
+    """
+    Derived frame per available symbol
+    Series with a fresh cache are read in-process; when several large ones
+    need deriving and more than one CPU is available, they are computed in
+    parallel worker processes
+    """
+    series = available_series(series)
+    stale = [symbol for symbol, path in series.items() if not data_cache.is_cached(path)]
+    stale_mb = sum(os.path.getsize(series[symbol]) for symbol in stale) / 2**20
+    workers = min(len(stale), max_workers or os.cpu_count() or 1)
+
+    frames = {}
+    if workers > 1 and stale_mb >= PARALLEL_MIN_MB:
+        # spawn rather than fork: the dashboard process runs server threads
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(workers, mp_context=context) as pool:
+            frames.update(zip(stale, pool.map(_derive, [series[symbol] for symbol in stale])))
+
+    for symbol, path in series.items():
+        if symbol not in frames:
+            frames[symbol] = data_cache.load_price_frame(path)
+    return {symbol: frames[symbol] for symbol in series}
+
+
+def stack(frames):
+    """Long frame of all series, sorted by (symbol, date), with a categorical symbol column"""
+    frames = {symbol: frame for symbol, frame in frames.items() if len(frame)}
+    if not frames:
+        return pd.DataFrame({'symbol': pd.Categorical([]), 'date_gregorian': pd.to_datetime([])})
+    codes = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames.values()])
+    long = pd.concat(list(frames.values()), ignore_index=True)
+    long.insert(0, 'symbol', pd.Categorical.from_codes(codes, categories=list(frames)))
+    return long
+
+
+class SeriesPanel:
+    """Long frame of every series plus per-symbol row bounds for slicing"""
+
+    def __init__(self, long):
+        self.long = long
+        self.symbols = list(long['symbol'].cat.categories)
+        codes = long['symbol'].cat.codes.to_numpy()
+        edges = np.searchsorted(codes, np.arange(len(self.symbols) + 1))
+        self._bounds = {symbol: (edges[i], edges[i + 1]) for i, symbol in enumerate(self.symbols)}
+        self.dates = long['date_gregorian'].to_numpy(dtype='datetime64[ns]')
+
+    @classmethod
+    def load(cls, series=SERIES, max_workers=MAX_WORKERS):
+        return cls(stack(load_frames(series, max_workers)))
+
+    def rows(self, symbol, start=None, end=None):
+        """Row bounds of one series inside start..end (inclusive)"""
+        lo, hi = self._bounds[symbol]
+        dates = self.dates[lo:hi]
+        first, last = lo, hi
+        if start is not None:
+            first = lo + np.searchsorted(dates, np.datetime64(pd.Timestamp(start), 'ns'), side='left')
+        if end is not None:
+            end = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+            last = lo + np.searchsorted(dates, np.datetime64(end, 'ns'), side='left')
+        return first, max(first, last)
+
+    def frame(self, symbol, start=None, end=None):
+        lo, hi = self.rows(symbol, start, end)
+        return self.long.iloc[lo:hi]
+
+    def wide(self, column, symbols=None, start=None, end=None):
+        """Dates x symbols table of one column (NaN where a series has no row)"""
+        symbols = self.symbols if symbols is None else symbols
+        return pd.concat(
+            {symbol: self.frame(symbol, start, end).set_index('date_gregorian')[column] for symbol in symbols},
+            axis=1
+        ).sort_index()
+
+    def with_crisis_mode(self, mode):
+        """Panel with is_crisis recomputed per series under the given rule"""
+        flags = [metrics.apply_crisis_mode(self.frame(symbol), mode)['is_crisis'] for symbol in self.symbols]
+        long = self.long.copy()
+        if flags:
+            long['is_crisis'] = pd.concat(flags).to_numpy()
+        return SeriesPanel(long)
+
+    def summary(self, symbols=None, start=None, end=None):
+        """Per-series change, drawdown from the in-range peak, volatility and crisis days"""
+        rows = []
+        for symbol in self.symbols if symbols is None else symbols:
+            frame = self.frame(symbol, start, end)
+            if len(frame) == 0:
+                continue
+            close = frame['close_price'].to_numpy(dtype=float)
+            rows.append({
+                'symbol': symbol,
+                'days': len(frame),
+                'last_close': close[-1],
+                'change': close[-1] / close[0] - 1,
+                'max_drawdown': (close / np.maximum.accumulate(close) - 1).min(),
+                'volatility': frame['ret_close_close'].std(),
+                'crisis_days': int(frame['is_crisis'].sum()),
+            })
+        return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    import time
+
+    for symbol, path in available_series().items():
+        print(f"{symbol}: {path.name} ({'cached' if data_cache.is_cached(path) else 'stale'})")
+
+    start = time.perf_counter()
+    panel = SeriesPanel.load()
+    print(f"Loaded {len(panel.symbols)} series, {len(panel.long):,} rows "
+          f"in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,34 @@
+"""
+Read-only datasets shared by every Streamlit session
+Objects held once per process (st.cache_resource) are rebuilt on
+non-writable NumPy arrays, so an accidental in-place write raises instead
+of leaking into the other sessions' data
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def read_only_frame(df):
+    """Copy of df whose NumPy-backed columns are non-writable"""
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, np.dtype):
+            values = column.to_numpy(copy=True)
+            values.flags.writeable = False
+            columns[name] = values
+        else:
+            # Extension arrays (strings, categoricals) are kept as they are
+            columns[name] = column
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def freeze(obj):
+    """Make an object's frame and array attributes read-only, in place"""
+    for name, value in vars(obj).items():
+        if isinstance(value, pd.DataFrame):
+            setattr(obj, name, read_only_frame(value))
+        elif isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return obj
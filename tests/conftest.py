@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import data_cache
+import validation
+
+
+@pytest.fixture
+def price_csv(tmp_path, monkeypatch):
+    """Copy of the USD/IRR dataset with the Parquet cache and quarantine kept in tmp_path"""
+    monkeypatch.setattr(data_cache, 'CACHE_DIR', tmp_path / '.cache')
+    monkeypatch.setattr(validation, 'QUARANTINE_DIR', tmp_path / 'quarantine')
+    path = tmp_path / 'Dollar_Rial_Price_Dataset.csv'
+    path.write_bytes(data_cache.EXCHANGE_RATE_FILE.read_bytes())
+    return path
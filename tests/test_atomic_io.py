@@ -0,0 +1,36 @@
+import os
+
+import atomic_io
+
+
+def test_new_file_mode_follows_umask(tmp_path):
+    old = os.umask(0o027)
+    try:
+        atomic_io.write_json({'a': 1}, tmp_path / 'new.json')
+    finally:
+        os.umask(old)
+    assert os.stat(tmp_path / 'new.json').st_mode & 0o777 == 0o640
+
+
+def test_replaced_file_keeps_mode(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('old\n')
+    os.chmod(path, 0o604)
+    with atomic_io.atomic_write(path) as f:
+        f.write('new\n')
+    assert path.read_text() == 'new\n'
+    assert os.stat(path).st_mode & 0o777 == 0o604
+    assert [p.name for p in tmp_path.iterdir()] == ['data.csv']
+
+
+def test_failed_write_leaves_target(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('old\n')
+    try:
+        with atomic_io.atomic_write(path) as f:
+            f.write('partial')
+            raise RuntimeError('boom')
+    except RuntimeError:
+        pass
+    assert path.read_text() == 'old\n'
+    assert [p.name for p in tmp_path.iterdir()] == ['data.csv']
@@ -0,0 +1,54 @@
+import os
+
+import pandas as pd
+
+import atomic_io
+import data_cache
+import metrics
+
+NEW_ROW = '850000,845000,860000,855000,23050,2.77%,2025/09/27,1404/07/05\n'
+
+
+def edit_csv(path, replace=None, new_row=None):
+    """Apply a text replacement and/or put a new (newest) row after the header"""
+    header, rest = path.read_text(encoding='utf-8').split('\n', 1)
+    if replace:
+        assert replace[0] in rest
+        rest = rest.replace(*replace)
+    path.write_text(header + '\n' + (new_row or '') + rest, encoding='utf-8')
+
+
+def test_append_extends_cache(price_csv):
+    cached = data_cache.load_price_frame(price_csv)
+    edit_csv(price_csv, new_row=NEW_ROW)
+
+    raw = metrics.read_price_csv(price_csv)
+    assert data_cache.extend_price_frame(cached, raw) is not None
+    pd.testing.assert_frame_equal(data_cache.load_price_frame(price_csv), metrics.build_price_frame(price_csv))
+
+
+def test_corrected_history_with_append_rebuilds(price_csv):
+    data_cache.load_price_frame(price_csv)
+    edit_csv(price_csv, replace=('834150,829600,847900,', '834150,829600,897900,'), new_row=NEW_ROW)
+
+    raw = metrics.read_price_csv(price_csv)
+    cached = pd.read_parquet(data_cache._cache_paths(price_csv)[0])
+    assert data_cache.extend_price_frame(cached, raw) is None
+
+    df = data_cache.load_price_frame(price_csv)
+    assert df.loc[df['date_gregorian'] == '2025-05-10', 'high_price'].item() == 897900
+    pd.testing.assert_frame_equal(df, metrics.build_price_frame(price_csv))
+
+
+def test_touched_csv_is_hashed_once(price_csv, monkeypatch):
+    data_cache.load_price_frame(price_csv)
+    stat = os.stat(price_csv)
+    os.utime(price_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    hashed = []
+    content_hash = atomic_io.content_hash
+    monkeypatch.setattr(atomic_io, 'content_hash', lambda path: hashed.append(path) or content_hash(path))
+    assert data_cache.is_cached(price_csv)
+    assert data_cache.is_cached(price_csv)
+    data_cache.load_price_frame(price_csv)
+    assert len(hashed) == 1
@@ -0,0 +1,21 @@
+import numpy as np
+
+import jalali
+
+
+def test_is_leap_matches_year_lengths():
+    years = np.arange(1000, 2000)
+    lengths = (jalali.to_gregorian(years + 1, 1, 1) - jalali.to_gregorian(years, 1, 1)).astype(np.int64)
+    np.testing.assert_array_equal(jalali.is_leap(years), lengths == 366)
+
+
+def test_cycle_year_32_is_not_leap():
+    assert not jalali.is_leap(1407)
+    assert jalali.to_gregorian(1407, 12, 30) == jalali.to_gregorian(1408, 1, 1)
+    assert jalali.is_leap(1403)
+
+
+def test_round_trip():
+    dates = np.arange('1990-01-01', '2030-01-01', dtype='datetime64[D]')
+    np.testing.assert_array_equal(jalali.to_gregorian(*jalali.from_gregorian(dates)), dates)
+    assert jalali.format_date(np.datetime64('2025-03-21')) == '1404/01/01'
@@ -0,0 +1,115 @@
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import news_fetcher
+
+DAYS = [datetime(2025, 6, day) for day in range(10, 18)]
+RATE_LIMITED_DAY = '20250611'
+MISSING_DAY = '20250612'
+
+
+class StubGdelt:
+    """GDELT stand-in: one article per day, a 429 once for one day, a 404 for another"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def respond(self, params):
+        day = params['startdatetime'][:8]
+        with self.lock:
+            self.requests.append(day)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            first_try = self.requests.count(day) == 1
+        try:
+            time.sleep(self.delay)
+            if day == MISSING_DAY:
+                return 404, {}
+            if day == RATE_LIMITED_DAY and first_try:
+                return 429, {}
+            return 200, {'articles': [{'title': f'Rial news {day}', 'url': f'http://x/{day}', 'domain': 'x'}]}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def gdelt():
+    stub = StubGdelt()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+            status, body = stub.respond(params)
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    stub.url = f'http://127.0.0.1:{server.server_address[1]}/api/v2/doc/doc'
+    yield stub
+    server.shutdown()
+    server.server_close()
+
+
+def client(url, cache=None):
+    return news_fetcher.GdeltClient(base_url=url, max_in_flight=4, requests_per_second=1000,
+                                    max_retries=2, backoff=0.01, cache=cache)
+
+
+def test_fetch_days_concurrent_with_retry_and_errors(gdelt):
+    with client(gdelt.url) as gdelt_client:
+        headlines, errors = gdelt_client.fetch_days(DAYS)
+
+    assert list(errors) == [datetime(2025, 6, 12)]
+    assert isinstance(errors[datetime(2025, 6, 12)], news_fetcher.requests.HTTPError)
+    assert sorted(h['title'][-8:] for h in headlines) == sorted(
+        d.strftime('%Y%m%d') for d in DAYS if d.strftime('%Y%m%d') != MISSING_DAY)
+    # The 429 is retried once; the 404 is not retried
+    assert gdelt.requests.count(RATE_LIMITED_DAY) == 2
+    assert gdelt.requests.count(MISSING_DAY) == 1
+    assert 1 < gdelt.max_in_flight <= 4
+
+
+def test_cached_days_are_not_requested_again(gdelt, tmp_path):
+    cache = news_fetcher.ResponseCache(tmp_path / 'gdelt')
+    days = [d for d in DAYS if d.strftime('%Y%m%d') != MISSING_DAY]
+    with client(gdelt.url, cache) as gdelt_client:
+        first, _ = gdelt_client.fetch_days(days)
+        requested = len(gdelt.requests)
+        second, errors = gdelt_client.fetch_days(days)
+
+    assert not errors
+    assert len(gdelt.requests) == requested
+    assert sorted(h['title'] for h in second) == sorted(h['title'] for h in first)
+
+
+def test_response_cache_counts_bytes_and_overwrites(tmp_path):
+    cache = news_fetcher.ResponseCache(tmp_path / 'gdelt', max_bytes=10_000)
+    params = news_fetcher.build_params(DAYS[0])
+    cache.put('u', {'day': 0}, {'articles': []})
+    for title in ('first', 'دلار ریال', 'third'):
+        cache.put('u', params, {'articles': [{'title': title}]}, ttl=60)
+
+    on_disk = sum(p.stat().st_size for p in (tmp_path / 'gdelt').iterdir())
+    assert cache._size == on_disk
+    assert len(list((tmp_path / 'gdelt').iterdir())) == 2
+    assert cache.get('u', params) == {'articles': [{'title': 'third'}]}
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from news_store import NewsStore
+
+
+def test_missing_dates_on_empty_store(tmp_path):
+    store = NewsStore.from_csv(tmp_path / 'missing.csv')
+    dates = list(pd.to_datetime(['2025-06-13', '2025-06-14']))
+    assert len(store) == 0
+    assert store.missing_dates(dates) == dates
+
+
+def test_missing_dates_skips_days_with_headlines():
+    store = NewsStore(pd.DataFrame({
+        'date': ['2025-06-13 09:30', '2025-06-20 18:00'],
+        'title': ['a', 'b'],
+        'url': ['u1', 'u2'],
+        'source': ['s', 's'],
+    }))
+    dates = list(pd.to_datetime(['2025-06-13', '2025-06-14', '2025-06-21']))
+    assert store.missing_dates(dates) == dates[1:]
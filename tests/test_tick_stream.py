@@ -0,0 +1,52 @@
+from datetime import date, datetime, timedelta
+import itertools
+
+import pytest
+
+import data_manifest
+import tick_stream
+
+
+def bar(close):
+    return tick_stream.Bar(datetime(2025, 9, 26), close, close, close, close, 1)
+
+
+def test_dataset_row_change_layout():
+    assert tick_stream.dataset_row(bar(588520), 588510)['Change Amount'] == 10
+    assert tick_stream.dataset_row(bar(588520), 588510)['Change Percent'] == '-'
+    assert tick_stream.dataset_row(bar(588520), 588520)['Change Amount'] == '-'
+    assert tick_stream.dataset_row(bar(600000), 588520)['Change Percent'] == '1.95%'
+    assert tick_stream.dataset_row(bar(588520), 588520)['Persian Date'] == '1404/07/04'
+
+
+def test_stub_refuses_the_dataset():
+    with pytest.raises(ValueError):
+        tick_stream.open_source('stub', csv_path=tick_stream.EXCHANGE_RATE_FILE)
+    with pytest.raises(ValueError):
+        tick_stream.open_source('stub', follow=True)
+
+
+def test_stub_feeds_a_scratch_copy(price_csv, monkeypatch):
+    monkeypatch.setattr(data_manifest, 'write_manifest', lambda *a, **k: pytest.fail('manifest republished'))
+    original = tick_stream.EXCHANGE_RATE_FILE.read_bytes()
+    ticks = tick_stream.open_source('stub', csv_path=price_csv)
+    until = datetime(2025, 9, 29)
+    bars = [bar for name, bar in tick_stream.ingest(itertools.takewhile(lambda t: t.time < until, ticks),
+                                                    price_csv, close_before=until)]
+
+    assert [bar.start.day for bar in bars] == [26, 27, 28]
+    assert tick_stream.latest_row(price_csv)[0] == date(2025, 9, 28)
+    assert tick_stream.EXCHANGE_RATE_FILE.read_bytes() == original
+
+
+def test_stub_follow_ticks_trail_the_wall_clock(price_csv, monkeypatch):
+    slept = []
+    monkeypatch.setattr(tick_stream.time, 'sleep', slept.append)
+    start = datetime.now()
+    ticks = tick_stream.open_source('stub', follow=True, csv_path=price_csv)
+    stamps = [tick.time for tick in itertools.islice(ticks, 5)]
+
+    # Each tick is only yielded once the wall clock has reached its time
+    assert stamps[0] >= start
+    for i, stamp in enumerate(stamps):
+        assert stamp - stamps[0] <= timedelta(seconds=sum(slept[:i]))
@@ -0,0 +1,27 @@
+import metrics
+import validation
+
+HEADER = 'Open Price,Low Price,High Price,Close Price,Change Amount,Change Percent,Gregorian Date,Persian Date\n'
+ROWS = [
+    '1072850,1072300,1085700,n/a,10850,1.01%,2025/09/25,1404/07/03\n',
+    '\n',
+    '1041100,0,1042100,1034900,5100,0.49%,2025/09/23,1404/07/01\n',
+    '1063100,1037200,1063100,1040000,18600,1.79%,2025/09/22,1404/06/31\n',
+    '1058400,1044500,1045000,1021400,8650,0.85%,2025/09/21,1404/06/30\n',
+    '1030050,1011500,1036500,1030050,-,-,2025/09/20,1404/06/29\n',
+]
+
+
+def test_quarantine_keeps_source_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(validation, 'QUARANTINE_DIR', tmp_path / 'quarantine')
+    path = tmp_path / 'prices.csv'
+    path.write_text(HEADER + ''.join(ROWS), encoding='utf-8')
+
+    result = metrics.check_price_csv(path)
+    assert result.quarantined['line'].tolist() == [2, 4, 6]
+    assert result.quarantined['record'].tolist() == [ROWS[0].strip(), ROWS[2].strip(), ROWS[4].strip()]
+    assert result.quarantined['violations'].tolist() == ['missing_value', 'non_positive_price', 'ohlc_inconsistent']
+    assert len(result.valid) == 2 and 'source_row' not in result.valid.columns
+
+    validation.write_quarantine(result, path)
+    assert validation.read_report(path) == result.report
@@ -0,0 +1,301 @@
+"""
+Streaming tick ingestion
+Price ticks from a file tail, a TCP socket or a local stub feed flow through
+generators into OHLC bars, holding only the currently open bar in memory.
+Each completed daily bar is added to the dataset CSV, the derived cache is
+extended incrementally (MetricEngine) and the data manifest is republished,
+so running dashboards pick the new day up on their next poll
+"""
+
+from collections import namedtuple
+import csv
+from datetime import datetime, timedelta
+import os
+from pathlib import Path
+import random
+import shutil
+import socket
+import time
+
+import atomic_io
+import data_cache
+import data_manifest
+import jalali
+
+EXCHANGE_RATE_FILE = data_cache.EXCHANGE_RATE_FILE
+HOURLY_BARS_FILE = data_cache.DATA_DIR / 'Dollar_Rial_Hourly_Bars.csv'
+
+Tick = namedtuple('Tick', 'time price')
+Bar = namedtuple('Bar', 'start open low high close ticks')
+
+# Bar lengths
+BAR_PERIODS = {
+    'daily': timedelta(days=1),
+    'hourly': timedelta(hours=1),
+}
+
+HOURLY_COLUMNS = ['Start', 'Open Price', 'Low Price', 'High Price', 'Close Price', 'Ticks']
+
+# Seconds between polls when following a file
+FOLLOW_POLL_SECONDS = 0.5
+
+
+# Tick sources
+def parse_ticks(lines):
+    """
+    Tick per 'timestamp,price' line (ISO timestamp, market local time)
+    Blank, comment and malformed lines are skipped
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        stamp, _, price = line.partition(',')
+        try:
+            yield Tick(datetime.fromisoformat(stamp.strip()).replace(tzinfo=None), float(price))
+        except ValueError:
+            continue
+
+
+def file_lines(path, follow=False, poll=FOLLOW_POLL_SECONDS):
+    """Lines of a file; with follow, keep yielding lines as they are appended (tail -f)"""
+    with open(path, encoding='utf-8') as f:
+        partial = ''
+        while True:
+            line = f.readline()
+            if not line:
+                if not follow:
+                    break
+                time.sleep(poll)
+                continue
+            partial += line
+            # A writer may be mid-line; wait for the newline
+            if partial.endswith('\n'):
+                yield partial
+                partial = ''
+        if partial:
+            yield partial
+
+
+def socket_lines(host, port, timeout=None):
+    """Lines received from a TCP feed until the server closes the connection"""
+    with socket.create_connection((host, port), timeout=timeout) as conn:
+        with conn.makefile('r', encoding='utf-8', newline='\n') as stream:
+            yield from stream
+
+
+def stub_ticks(start_price, start=None, until=None, step=timedelta(minutes=1), volatility=0.001,
+               seed=None, delay=0.0):
+    """Random-walk feed for local testing, endless unless until is given (delay = seconds between ticks)"""
+    rng = random.Random(seed)
+    moment = start or datetime.now()
+    price = float(start_price)
+    while until is None or moment < until:
+        yield Tick(moment, round(price))
+        price *= 1 + rng.gauss(0, volatility)
+        moment += step
+        if delay:
+            time.sleep(delay)
+
+
+def same_file(a, b):
+    return Path(a).resolve() == Path(b).resolve()
+
+
+def open_source(spec, follow=False, csv_path=EXCHANGE_RATE_FILE):
+    """
+    Ticks for a source spec: 'stub', 'tcp://host:port' or a file path
+    The stub makes up prices, so it only feeds a scratch copy of the dataset
+    (csv_path). Without follow, it replays from the day after the copy's
+    last row up to now; with follow it runs live, one tick a second
+    """
+    if spec == 'stub':
+        if same_file(csv_path, EXCHANGE_RATE_FILE):
+            raise ValueError(f"The 'stub' source makes up prices; give a scratch copy of "
+                             f"{EXCHANGE_RATE_FILE.name} to write to instead of the dataset")
+        last_date, last_close = latest_row(csv_path)
+        if follow:
+            # Tick times trail the wall clock, so no bar is dated in the future
+            return stub_ticks(last_close or 1_000_000, step=timedelta(seconds=1), delay=1.0)
+        start = datetime.combine(last_date + timedelta(days=1), datetime.min.time()) if last_date else None
+        return stub_ticks(last_close or 1_000_000, start=start, until=datetime.now())
+    if spec.startswith('tcp://'):
+        host, _, port = spec[len('tcp://'):].rpartition(':')
+        return parse_ticks(socket_lines(host, int(port)))
+    return parse_ticks(file_lines(spec, follow))
+
+
+# Bar aggregation
+def bucket_start(moment, period):
+    """Start of the period containing moment (periods divide a day)"""
+    day = datetime(moment.year, moment.month, moment.day)
+    return day + ((moment - day) // period) * period
+
+
+class BarAggregator:
+    """The open bar of one period; ticks older than it are counted and dropped"""
+
+    def __init__(self, period):
+        self.period = period
+        self.bar = None
+        self.end = None
+        self.late = 0
+
+    def add(self, tick):
+        """Consume one tick; returns the bar it completed, if any"""
+        bar = self.bar
+        if bar is not None and bar.start <= tick.time < self.end:
+            self.bar = Bar(bar.start, bar.open, min(bar.low, tick.price), max(bar.high, tick.price),
+                           tick.price, bar.ticks + 1)
+            return None
+        if bar is not None and tick.time < bar.start:
+            self.late += 1
+            return None
+        start = bucket_start(tick.time, self.period)
+        self.bar = Bar(start, tick.price, tick.price, tick.price, tick.price, 1)
+        self.end = start + self.period
+        return bar
+
+    def close_before(self, moment):
+        """Complete and return the open bar if its period ended by moment"""
+        bar = self.bar
+        if bar is not None and bar.start + self.period <= moment:
+            self.bar = None
+            return bar
+        return None
+
+
+def aggregate_bars(ticks, period=BAR_PERIODS['daily'], flush=False):
+    """Completed bars from a tick stream (the last, open bar only with flush)"""
+    aggregator = BarAggregator(period)
+    for tick in ticks:
+        bar = aggregator.add(tick)
+        if bar is not None:
+            yield bar
+    if flush and aggregator.bar is not None:
+        yield aggregator.bar
+
+
+# Dataset output
+def dataset_row(bar, previous_close):
+    """A daily bar in the dataset's layout (unsigned change, '-' for a zero change or 0.00%)"""
+    change = abs(round(bar.close) - previous_close) if previous_close else 0
+    percent = f"{change / previous_close:.2%}" if change else '-'
+    return {
+        'Open Price': round(bar.open),
+        'Low Price': round(bar.low),
+        'High Price': round(bar.high),
+        'Close Price': round(bar.close),
+        'Change Amount': change or '-',
+        'Change Percent': '-' if percent == '0.00%' else percent,
+        'Gregorian Date': bar.start.strftime('%Y/%m/%d'),
+        'Persian Date': jalali.format_date(bar.start),
+    }
+
+
+def latest_row(csv_path=EXCHANGE_RATE_FILE):
+    """(date, close) of the newest dataset row; the CSV is stored newest-first"""
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        row = next(csv.DictReader(f), None)
+    if row is None:
+        return None, None
+    return datetime.strptime(row['Gregorian Date'], '%Y/%m/%d').date(), int(row['Close Price'])
+
+
+def append_daily_bars(bars, csv_path=EXCHANGE_RATE_FILE):
+    """
+    Add completed daily bars newer than the dataset's last day
+    New rows go ahead of the existing ones (newest-first); the rest of the
+    file is copied through unparsed in one atomic replace. Returns the
+    number of rows added
+    """
+    last_date, last_close = latest_row(csv_path)
+    rows = []
+    for bar in bars:
+        if last_date is not None and bar.start.date() <= last_date:
+            continue
+        rows.append(dataset_row(bar, last_close))
+        last_date, last_close = bar.start.date(), round(bar.close)
+    if not rows:
+        return 0
+
+    with open(csv_path, newline='', encoding='utf-8') as src, \
+            atomic_io.atomic_write(csv_path, newline='', encoding='utf-8') as dst:
+        header = src.readline()
+        dst.write(header)
+        writer = csv.DictWriter(dst, fieldnames=next(csv.reader([header])), lineterminator='\n')
+        writer.writerows(reversed(rows))
+        shutil.copyfileobj(src, dst)
+    return len(rows)
+
+
+def append_hourly_bars(bars, path=HOURLY_BARS_FILE):
+    """Append hourly bars (oldest-first) to their own CSV"""
+    new_file = not os.path.exists(path)
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        if new_file:
+            writer.writerow(HOURLY_COLUMNS)
+        writer.writerows([bar.start.isoformat(timespec='minutes'), round(bar.open), round(bar.low),
+                          round(bar.high), round(bar.close), bar.ticks] for bar in bars)
+
+
+def publish(csv_path=EXCHANGE_RATE_FILE):
+    """Extend the derived cache with the new rows and republish the manifest if it tracks csv_path"""
+    df = data_cache.load_price_frame(csv_path)
+    if any(same_file(csv_path, path) for path in data_manifest.DATASETS.values()):
+        data_manifest.write_manifest()
+    return df
+
+
+def ingest(ticks, csv_path=EXCHANGE_RATE_FILE, hourly_path=None, close_before=None, publish_bars=True):
+    """
+    Consume a tick stream, writing each bar as soon as it completes
+    Yields (period name, bar) per completed bar. With close_before, bars
+    whose period ended by then are completed when the stream ends
+    """
+    daily = BarAggregator(BAR_PERIODS['daily'])
+    hourly = BarAggregator(BAR_PERIODS['hourly']) if hourly_path else None
+
+    def completed(name, bar):
+        if name == 'hourly':
+            append_hourly_bars([bar], hourly_path)
+        elif append_daily_bars([bar], csv_path) and publish_bars:
+            publish(csv_path)
+        return name, bar
+
+    for tick in ticks:
+        if hourly is not None:
+            bar = hourly.add(tick)
+            if bar is not None:
+                yield completed('hourly', bar)
+        bar = daily.add(tick)
+        if bar is not None:
+            yield completed('daily', bar)
+
+    if close_before is not None:
+        for name, aggregator in (('hourly', hourly), ('daily', daily)):
+            bar = aggregator.close_before(close_before) if aggregator is not None else None
+            if bar is not None:
+                yield completed(name, bar)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Ingest price ticks into daily (and hourly) bars')
+    parser.add_argument('source', help="tick file, tcp://host:port or 'stub'")
+    parser.add_argument('--follow', action='store_true', help='keep reading as ticks arrive')
+    parser.add_argument('--hourly', action='store_true', help=f'also write {HOURLY_BARS_FILE.name}')
+    parser.add_argument('--csv', type=Path, default=EXCHANGE_RATE_FILE,
+                        help="dataset CSV to append daily bars to (a scratch copy for 'stub')")
+    args = parser.parse_args()
+
+    try:
+        ticks = open_source(args.source, args.follow, args.csv)
+    except ValueError as e:
+        parser.error(str(e))
+    hourly_path = HOURLY_BARS_FILE if args.hourly else None
+    for name, bar in ingest(ticks, args.csv, hourly_path=hourly_path, close_before=datetime.now()):
+        print(f"{'📅' if name == 'daily' else '🕐'} {name} bar {bar.start:%Y-%m-%d %H:%M}: "
+              f"O {bar.open:,.0f} H {bar.high:,.0f} L {bar.low:,.0f} C {bar.close:,.0f} ({bar.ticks} ticks)")
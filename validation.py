@@ -0,0 +1,129 @@
+"""
+Vectorized validation of the cleaned price frame
+Every rule is a boolean mask over the whole history, built with NumPy
+comparisons in one pass. Rows breaking an error rule are quarantined: kept
+out of the derived frame and written aside for review. Warning rules are
+only counted in the report
+"""
+
+from collections import namedtuple
+import json
+from pathlib import Path
+import time
+
+import numpy as np
+
+import atomic_io
+
+QUARANTINE_DIR = atomic_io.DATA_DIR / 'quarantine'
+
+PRICE_COLUMNS = ['open_price', 'low_price', 'high_price', 'close_price']
+
+# Longest calendar gap between consecutive rows that is not reported
+# (weekends and the Nowruz holidays stay within it)
+MAX_GAP_DAYS = 5
+
+# Reported when Change Amount and the close-to-close change differ by more
+# than this fraction of the close
+CHANGE_TOLERANCE = 0.01
+
+# rule -> (severity, description)
+RULES = {
+    'missing_value': ('error', 'Unparseable date or price'),
+    'non_positive_price': ('error', 'Price at or below zero'),
+    'ohlc_inconsistent': ('error', 'Low <= Open/Close <= High violated'),
+    'duplicate_date': ('error', 'Date repeats the previous row'),
+    'missing_days': ('warning', f'More than {MAX_GAP_DAYS} days since the previous row'),
+    'change_mismatch': ('warning', 'Change Amount disagrees with consecutive closes'),
+}
+ERROR_RULES = [name for name, (severity, _) in RULES.items() if severity == 'error']
+
+Validation = namedtuple('Validation', 'valid quarantined report')
+
+
+def rule_masks(df):
+    """Mask per rule, True where a row breaks it (df sorted by date)"""
+    prices = df[PRICE_COLUMNS].to_numpy(dtype=float)
+    open_price, low, high, close = prices.T
+    dates = df['date_gregorian'].to_numpy(dtype='datetime64[D]')
+    amount = df['change_amount'].to_numpy(dtype=float)
+    has_date = ~np.isnat(dates)
+    days = dates.astype(np.int64)
+
+    # Rules comparing a row with the previous one
+    duplicate = np.zeros(len(df), dtype=bool)
+    gap, mismatch = duplicate.copy(), duplicate.copy()
+    both_dated = has_date[1:] & has_date[:-1]
+    duplicate[1:] = both_dated & (days[1:] == days[:-1])
+    gap[1:] = both_dated & (days[1:] - days[:-1] > MAX_GAP_DAYS)
+    with np.errstate(invalid='ignore'):
+        mismatch[1:] = np.abs(amount[1:] - np.abs(np.diff(close))) > CHANGE_TOLERANCE * close[1:]
+
+    return {
+        'missing_value': ~has_date | np.isnan(prices).any(axis=1),
+        'non_positive_price': (prices <= 0).any(axis=1),
+        'ohlc_inconsistent': ((low > high) | (open_price < low) | (open_price > high) |
+                              (close < low) | (close > high)),
+        'duplicate_date': duplicate,
+        'missing_days': gap,
+        'change_mismatch': mismatch,
+    }
+
+
+def validate(df):
+    """Split a cleaned frame into valid rows, quarantined rows and a report"""
+    start = time.perf_counter()
+    masks = rule_masks(df)
+    flags = np.column_stack(list(masks.values()))
+    errors = flags[:, [list(RULES).index(name) for name in ERROR_RULES]].any(axis=1)
+
+    # Label each distinct combination of broken rules once
+    quarantined = df[errors].copy()
+    codes = flags[errors].astype(np.int64) @ (1 << np.arange(len(RULES)))
+    combos, inverse = np.unique(codes, return_inverse=True)
+    labels = np.array([', '.join(name for bit, name in enumerate(RULES) if code >> bit & 1) for code in combos],
+                      dtype=object)
+    quarantined['violations'] = labels[inverse]
+    valid = df[~errors].reset_index(drop=True) if errors.any() else df
+
+    report = {
+        'rows': len(df),
+        'quarantined': int(errors.sum()),
+        'rules': {name: int(mask.sum()) for name, mask in masks.items() if mask.any()},
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+    }
+    return Validation(valid, quarantined, report)
+
+
+def format_report(report):
+    """Compact summary lines: quarantined rows by rule, then warnings"""
+    counts = report['rules']
+    errors = ', '.join(f"{name} {counts[name]}" for name in ERROR_RULES if name in counts)
+    warnings = ', '.join(f"{name} {count}" for name, count in counts.items() if name not in ERROR_RULES)
+    lines = [f"{report['rows']:,} rows checked in {report['elapsed_ms']} ms, "
+             f"{report['quarantined']:,} quarantined" + (f" ({errors})" if errors else "")]
+    if warnings:
+        lines.append(f"Warnings: {warnings}")
+    return lines
+
+
+def quarantine_paths(csv_path):
+    stem = Path(csv_path).stem
+    return QUARANTINE_DIR / f'{stem}.csv', QUARANTINE_DIR / f'{stem}.report.json'
+
+
+def write_quarantine(result, csv_path):
+    """Write the quarantined rows and the report for csv_path"""
+    rows_path, report_path = quarantine_paths(csv_path)
+    atomic_io.write_csv(result.quarantined, rows_path, index=False)
+    atomic_io.write_json(result.report, report_path, indent=2)
+    return rows_path
+
+
+def read_report(csv_path):
+    """Last validation report written for csv_path (None if there is none)"""
+    try:
+        with open(quarantine_paths(csv_path)[1]) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
@@ -0,0 +1,23 @@
+"""
+Dashboard pages
+Each page lives in its own module exposing render(ctx) and is imported the
+first time it is shown, so plotting code and page-only datasets stay
+unloaded until a page needs them
+"""
+
+import importlib
+
+PAGES = {
+    "📈 Overview": "overview",
+    "📉 Time Series Analysis": "time_series",
+    "🚨 Crisis Analysis": "crisis",
+    "📰 News Impact": "news",
+    "📊 Risk Metrics": "risk",
+    "🌐 Cross-Pair Comparison": "cross_pair",
+    "💡 Insights": "insights",
+}
+
+
+def render(page, ctx):
+    """Import the page's module on first use and render it"""
+    importlib.import_module(f"{__name__}.{PAGES[page]}").render(ctx)
@@ -0,0 +1,34 @@
+"""
+Startup benchmark: python -m views
+Runs app.py headlessly in this (fresh) process and times the first script
+run, the first visit to each page and a warm revisit of each page
+"""
+
+import os
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from views import PAGES
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def timed_run(app):
+    start = time.perf_counter()
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception)
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    app = AppTest.from_file(APP_PATH, default_timeout=300)
+    first_run = timed_run(app)
+    print(f"first run    {next(iter(PAGES)):<26} {first_run:>7,.0f} ms")
+
+    pages = list(PAGES)
+    for label, order in (("first visit", pages[1:]), ("warm visit", pages)):
+        for page in order:
+            app.sidebar.selectbox[0].set_value(page)
+            print(f"{label:<12} {page:<26} {timed_run(app):>7,.0f} ms")
@@ -0,0 +1,183 @@
+"""
+Cached loaders and the per-rerun page context
+Datasets are loaded and sliced on first access, so a page only pays for
+the frames it actually uses
+"""
+
+from functools import cached_property
+import os
+
+import plotly.io as pio
+import streamlit as st
+
+import data_cache
+import data_manifest
+import metrics
+import rollups
+import series_registry
+import validation
+from memo_cache import LRUCache
+from news_store import NewsStore
+from range_index import DateRangeIndex
+from series_registry import SeriesPanel
+from shared_data import freeze, read_only_frame
+from window_metrics import RangeMetricService
+
+NEWS_FILE = data_manifest.DATASETS['news']
+
+# Serialized figures kept across reruns (downsampled traces keep each one
+# to roughly 100 KB of JSON)
+FIGURE_CACHE_ENTRIES = 64
+
+# Memory budgets for the derived caches, shared by all sessions
+DERIVED_CACHE_MB = int(os.environ.get('DASHBOARD_DERIVED_CACHE_MB', 128))
+FIGURE_CACHE_MB = int(os.environ.get('DASHBOARD_FIGURE_CACHE_MB', 32))
+
+# Loader entries kept per crisis rule: the current data version plus the
+# previous one while sessions switch over
+VERSIONS_KEPT = 2
+MODE_ENTRIES = VERSIONS_KEPT * len(metrics.CRISIS_MODES)
+CALENDAR_ENTRIES = MODE_ENTRIES * len(rollups.CALENDARS)
+
+
+# Base datasets are held once per process as read-only resources (no
+# per-session copies). The version arguments come from the data manifest
+# and only key the caches: a new version loads alongside the old one
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def load_data(prices_version):
+    """Load and preprocess exchange rate data"""
+    return read_only_frame(data_cache.load_price_frame())
+
+@st.cache_resource(max_entries=MODE_ENTRIES)
+def load_crisis_data(crisis_mode, prices_version):
+    """Exchange rate data with is_crisis computed under the selected rule"""
+    return read_only_frame(metrics.apply_crisis_mode(load_data(prices_version), crisis_mode))
+
+@st.cache_resource(max_entries=CALENDAR_ENTRIES)
+def load_rollups(crisis_mode, prices_version, calendar='gregorian'):
+    """Monthly rollups, built once per dataset, crisis rule and calendar"""
+    return freeze(rollups.Rollups(load_crisis_data(crisis_mode, prices_version), calendar))
+
+@st.cache_resource(max_entries=MODE_ENTRIES)
+def load_range_index(crisis_mode, prices_version):
+    """Binary-search date index with crisis prefix sums"""
+    return freeze(DateRangeIndex(load_crisis_data(crisis_mode, prices_version)))
+
+@st.cache_resource(max_entries=MODE_ENTRIES)
+def load_metric_service(crisis_mode, prices_version):
+    """Per-range drawdown/rolling metrics, memoized across reruns"""
+    max_bytes = DERIVED_CACHE_MB * 2**20 // MODE_ENTRIES
+    return RangeMetricService(load_crisis_data(crisis_mode, prices_version), max_bytes=max_bytes)
+
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def load_validation_report(prices_version):
+    """Validation report written when the price frame was last derived"""
+    load_data(prices_version)
+    return validation.read_report(data_cache.EXCHANGE_RATE_FILE)
+
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def load_news_data(news_version):
+    """Load news data into a date-indexed store if available"""
+    if not os.path.exists(NEWS_FILE):
+        return None
+    return freeze(NewsStore.from_csv(NEWS_FILE))
+
+# Manifest datasets behind the series panel
+SERIES_DATASETS = tuple(series_registry.dataset_name(symbol) for symbol in series_registry.SERIES)
+
+def series_version(versions):
+    """Version tokens of every registered series (keys the panel loaders)"""
+    return tuple(versions.get(name) for name in SERIES_DATASETS)
+
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def load_series(series_version):
+    """All registered price series in one long frame keyed by symbol"""
+    return freeze(SeriesPanel.load())
+
+@st.cache_resource(max_entries=MODE_ENTRIES)
+def load_series_panel(crisis_mode, series_version):
+    """Series panel with is_crisis computed per series under the selected rule"""
+    return freeze(load_series(series_version).with_crisis_mode(crisis_mode))
+
+@st.cache_resource
+def load_figure_cache():
+    """Serialized figure JSON, shared across reruns and sessions"""
+    return LRUCache(FIGURE_CACHE_ENTRIES, FIGURE_CACHE_MB * 2**20)
+
+
+def warm_datasets(versions, changed):
+    """Build the datasets affected by a new data version (watcher thread)"""
+    if 'prices' in changed:
+        for crisis_mode in metrics.CRISIS_MODES:
+            load_range_index(crisis_mode, versions['prices'])
+            for calendar in rollups.CALENDARS:
+                load_rollups(crisis_mode, versions['prices'], calendar)
+            load_metric_service(crisis_mode, versions['prices'])
+    if 'news' in changed:
+        load_news_data(versions['news'])
+    if any(series_registry.dataset_name(symbol) in changed for symbol in series_registry.SERIES):
+        for crisis_mode in metrics.CRISIS_MODES:
+            load_series_panel(crisis_mode, series_version(versions))
+
+@st.cache_resource
+def load_data_watcher():
+    """Process-wide manifest watcher; switches datasets once they are loaded"""
+    return data_manifest.ManifestWatcher(warm_datasets)
+
+
+class PageContext:
+    """Selections for the current rerun; datasets are built on first use"""
+
+    def __init__(self, page, crisis_mode, range_start, range_end, versions, calendar='gregorian'):
+        self.page = page
+        self.crisis_mode = crisis_mode
+        self.calendar = calendar
+        self.range_start = range_start
+        self.range_end = range_end
+        self.versions = versions
+        self.range_index = load_range_index(crisis_mode, versions['prices'])
+        self.range_lo, self.range_hi = self.range_index.bounds(range_start, range_end)
+
+    @property
+    def df(self):
+        return self.range_index.df
+
+    @cached_property
+    def metric_service(self):
+        return load_metric_service(self.crisis_mode, self.versions['prices'])
+
+    @cached_property
+    def df_filtered(self):
+        """Selected rows, with drawdown measured from the peak inside the range"""
+        return self.metric_service.frame(self.range_lo, self.range_hi)
+
+    @cached_property
+    def crisis_filtered(self):
+        return self.range_index.select_crisis(self.range_start, self.range_end)
+
+    @cached_property
+    def period_rollup(self):
+        """Monthly rollups for the selected range (whole months + partial edges)"""
+        period_rollups = load_rollups(self.crisis_mode, self.versions['prices'], self.calendar)
+        return period_rollups.for_range(self.df, self.range_start, self.range_end)
+
+    @cached_property
+    def series_panel(self):
+        return load_series_panel(self.crisis_mode, series_version(self.versions))
+
+    @cached_property
+    def news_store(self):
+        return load_news_data(self.versions['news'])
+
+    def show_figure(self, name, build, *params, deps=('prices',)):
+        """
+        Render a figure from the JSON cache, keyed on
+        (page, date_range, data_version, calendar, params); build() only
+        runs on a miss. The data version covers only the datasets the
+        figure reads (deps), so reloading another dataset keeps it cached
+        """
+        data_version = tuple((dataset, self.versions.get(dataset)) for dataset in deps)
+        key = (self.page, name, self.range_start, self.range_end,
+               self.crisis_mode, data_version, self.calendar) + params
+        fig_json = load_figure_cache().get_or_compute(key, lambda: build().to_json(validate=False))
+        st.plotly_chart(pio.from_json(fig_json), use_container_width=True)
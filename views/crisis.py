@@ -0,0 +1,65 @@
+"""Crisis analysis: crisis vs normal days, drawdown and timeline"""
+
+import pandas as pd
+import streamlit as st
+
+import figures
+import rollups
+
+
+def render(ctx):
+    df_filtered = ctx.df_filtered
+    crisis_filtered = ctx.crisis_filtered
+    period_rollup = ctx.period_rollup
+    crisis_mode = ctx.crisis_mode
+    
+    st.markdown('<p class="main-header">🚨 Crisis Analysis</p>', unsafe_allow_html=True)
+    
+    # Crisis metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    split = rollups.crisis_split(period_rollup)
+    normal_returns = split['normal_return']
+    crisis_returns = split['crisis_return']
+    
+    with col1:
+        st.metric("Crisis Days", f"{len(crisis_filtered):,}", f"{len(crisis_filtered)/len(df_filtered)*100:.1f}%")
+    with col2:
+        st.metric("Normal Day Return", f"{normal_returns:.3%}")
+    with col3:
+        st.metric("Crisis Day Return", f"{crisis_returns:.3%}")
+    with col4:
+        st.metric("Return Difference", f"{abs(crisis_returns - normal_returns):.3%}")
+    
+    st.markdown("---")
+    
+    # Drawdown chart
+    st.markdown("### 📉 Maximum Drawdown Over Time")
+    
+    ctx.show_figure('drawdown', lambda: figures.drawdown(df_filtered, threshold_line=crisis_mode == 'fixed'))
+    
+    # Crisis comparison
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 📊 Returns: Crisis vs Normal")
+        
+        comparison_data = pd.DataFrame({
+            'Type': ['Normal Days', 'Crisis Days'],
+            'Avg Return': [normal_returns * 100, crisis_returns * 100],
+            'Avg Volatility': [split['normal_vol'] * 100, split['crisis_vol'] * 100]
+        })
+        
+        ctx.show_figure('crisis_returns', lambda: figures.crisis_return_comparison(comparison_data))
+    
+    with col2:
+        st.markdown("### 📈 Intraday Volatility Comparison")
+        
+        ctx.show_figure('intraday_volatility', lambda: figures.intraday_volatility_box(df_filtered))
+    
+    # Crisis timeline
+    st.markdown("### 📅 Crisis Timeline")
+    
+    yearly_crisis = rollups.by_year(period_rollup)
+    
+    ctx.show_figure('crisis_timeline', lambda: figures.crisis_timeline(yearly_crisis))
@@ -0,0 +1,69 @@
+"""Cross-pair comparison: every registered series side by side"""
+
+import pandas as pd
+import streamlit as st
+
+import figures
+import series_registry
+from views.context import SERIES_DATASETS
+
+
+def render(ctx):
+    panel = ctx.series_panel
+
+    st.markdown('<p class="main-header">🌐 Cross-Pair Comparison</p>', unsafe_allow_html=True)
+
+    if len(panel.symbols) < 2:
+        missing = [path.name for symbol, path in series_registry.SERIES.items() if symbol not in panel.symbols]
+        st.info(f"Only {', '.join(panel.symbols)} is available. Add {', '.join(missing)} "
+                "(same layout as the USD/IRR dataset) to compare series here.")
+
+    symbols = st.multiselect("Series", panel.symbols, default=panel.symbols)
+    if not symbols:
+        return
+    symbols = tuple(symbols)
+
+    # Summary per series over the selected range
+    summary = panel.summary(symbols, ctx.range_start, ctx.range_end)
+    if len(summary) == 0:
+        st.warning("No data for the selected series in this date range.")
+        return
+
+    st.markdown("### 📋 Series Summary")
+    st.dataframe(pd.DataFrame({
+        'Series': summary['symbol'],
+        'Days': summary['days'],
+        'Last Close': summary['last_close'].map('{:,.0f}'.format),
+        'Change': summary['change'].map('{:+.1%}'.format),
+        'Max Drawdown': summary['max_drawdown'].map('{:.1%}'.format),
+        'Return Volatility': summary['volatility'].map('{:.3%}'.format),
+        'Crisis Days': summary['crisis_days'],
+    }), use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### 📈 Relative Performance")
+
+        def normalized():
+            closes = panel.wide('close_price', symbols, ctx.range_start, ctx.range_end).astype(float)
+            return figures.normalized_prices(closes / closes.bfill().iloc[0] * 100)
+
+        ctx.show_figure('normalized_prices', normalized, symbols, deps=SERIES_DATASETS)
+
+    with col2:
+        st.markdown("### 🔗 Daily Return Correlation")
+
+        if len(symbols) > 1:
+            ctx.show_figure(
+                'return_correlation',
+                lambda: figures.correlation_heatmap(
+                    panel.wide('ret_close_close', symbols, ctx.range_start, ctx.range_end), symbols
+                ),
+                symbols,
+                deps=SERIES_DATASETS
+            )
+        else:
+            st.info("Select at least two series to compare their returns.")
@@ -0,0 +1,266 @@
+"""Insights: executive summary, findings and methodology"""
+
+import streamlit as st
+
+import figures
+import rollups
+
+# First year of the "recent" period in the trend metric, per calendar
+RECENT_FROM = {'gregorian': 2020, 'jalali': 1399}
+
+
+def render(ctx):
+    df_filtered = ctx.df_filtered
+    crisis_filtered = ctx.crisis_filtered
+    period_rollup = ctx.period_rollup
+    news_df = ctx.news_store.frame if ctx.news_store is not None else None
+    
+    st.markdown('<p class="main-header">💡 Key Insights & Findings</p>', unsafe_allow_html=True)
+    
+    # Calculate key statistics
+    total_days = len(df_filtered)
+    crisis_days_count = len(crisis_filtered)
+    crisis_pct = crisis_days_count / total_days * 100
+    
+    split = rollups.crisis_split(period_rollup)
+    normal_return = split['normal_return']
+    crisis_return = split['crisis_return']
+    
+    max_drawdown = df_filtered['drawdown'].min()
+    max_drawdown_date = df_filtered.loc[df_filtered['drawdown'].idxmin(), 'date_gregorian'].date()
+    
+    worst_day = crisis_filtered.loc[crisis_filtered['ret_close_close'].idxmin()]
+    
+    # Executive Summary
+    st.markdown("## 📋 Executive Summary")
+    st.markdown(f"""
+    This analysis examines **{total_days:,} trading days** of USD/IRR exchange rate data spanning 
+    **{(df_filtered['date_gregorian'].max() - df_filtered['date_gregorian'].min()).days:,} days**. 
+    Using statistical methods, we identified **{crisis_days_count:,} crisis days** ({crisis_pct:.1f}% of all trading days) 
+    characterized by extreme volatility and significant currency depreciation.
+    """)
+    
+    st.markdown("---")
+    
+    # Key Findings
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown("## 🔍 Key Findings")
+        
+        st.markdown("### 1. Crisis Frequency & Severity")
+        st.markdown(f"""
+        - **{crisis_days_count:,} crisis days** identified over the analysis period
+        - Crisis days represent **{crisis_pct:.1f}%** of all trading days
+        - Average return on **normal days**: {normal_return:.3%}
+        - Average return on **crisis days**: {crisis_return:.2%}
+        - **{abs(crisis_return/normal_return):.1f}x worse** performance on crisis days
+        """)
+        
+        st.markdown("### 2. Maximum Risk Exposure")
+        st.markdown(f"""
+        - **Worst single-day loss**: {worst_day['ret_close_close']:.2%} on {worst_day['date_gregorian'].date()}
+        - **Maximum drawdown**: {max_drawdown:.2%} (reached on {max_drawdown_date})
+        - **Currency depreciation**: Over {(1 - (df_filtered['close_price'].iloc[0] / df_filtered['close_price'].iloc[-1])) * 100:.0f}% value loss
+        """)
+        
+        st.markdown("### 3. Volatility Patterns")
+        normal_vol = split['normal_vol']
+        crisis_vol = split['crisis_vol']
+        
+        st.markdown(f"""
+        - Crisis days show **{crisis_vol/normal_vol:.1f}x higher** intraday volatility
+        - Normal day volatility: {normal_vol:.3%}
+        - Crisis day volatility: {crisis_vol:.3%}
+        - Volatility clustering observed around major geopolitical events
+        """)
+    
+    with col2:
+        st.markdown("## 📊 Crisis Severity")
+        
+        # Crisis severity gauge
+        ctx.show_figure('crisis_gauge', lambda: figures.crisis_gauge(crisis_pct))
+        
+        st.markdown("### 📈 Trend Analysis")
+        yearly = rollups.by_year(period_rollup)
+        recent_from = RECENT_FROM[ctx.calendar]
+        recent_years = yearly[yearly['year'] >= recent_from]
+        old_years = yearly[yearly['year'] < recent_from]
+        recent_crisis_pct = recent_years['crisis_days'].sum() / recent_years['total_days'].sum() * 100
+        old_crisis_pct = old_years['crisis_days'].sum() / old_years['total_days'].sum() * 100
+        
+        trend = "increasing" if recent_crisis_pct > old_crisis_pct else "decreasing"
+        st.metric(
+            f"Recent Trend ({recent_from}+)",
+            f"{recent_crisis_pct:.1f}%",
+            f"{recent_crisis_pct - old_crisis_pct:+.1f}pp vs pre-{recent_from}"
+        )
+    
+    st.markdown("---")
+    
+    # Geopolitical Context
+    st.markdown("## 🌍 Geopolitical Context")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### Major Crisis Periods")
+        st.markdown("""
+        **2012 (Sanctions Era)**
+        - International sanctions imposed
+        - 71 crisis days identified
+        - Currency depreciation > 50%
+        
+        **2018 (JCPOA Withdrawal)**
+        - US withdrawal from nuclear deal
+        - Renewed sanctions
+        - Market panic and capital flight
+        
+        **2020-2022 (Pandemic & Political Tensions)**
+        - COVID-19 economic impact
+        - Regional conflicts
+        - Escalating US-Iran tensions
+        
+        **2025 (Recent Period)**
+        - Ongoing geopolitical uncertainty
+        - News correlation shows strong link to international events
+        """)
+    
+    with col2:
+        st.markdown("### Correlation with World Events")
+        if news_df is not None:
+            st.markdown(f"""
+            **News Analysis Results:**
+            - {len(news_df):,} headlines collected for crisis days
+            - {news_df['date'].nunique():,} unique crisis days with news coverage
+            - {news_df['source'].nunique():,} different news sources
+            
+            **Common Themes:**
+            - US-Iran relations
+            - Sanctions and diplomacy
+            - Regional conflicts
+            - Economic policies
+            - Nuclear program developments
+            
+            Strong correlation observed between:
+            - Negative geopolitical news → Currency depreciation
+            - Sanction announcements → Immediate market reaction
+            - Diplomatic tensions → Increased volatility
+            """)
+        else:
+            st.info("News data analysis available when GDELT API integration is run.")
+    
+    st.markdown("---")
+    
+    # Business Applications
+    st.markdown("## 💼 Business Applications")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("### 🏦 For Financial Institutions")
+        st.markdown("""
+        - **Risk Management**: Use crisis detection for capital allocation
+        - **Hedging Strategies**: Time FX hedges based on volatility patterns
+        - **Portfolio Optimization**: Adjust exposure during high-risk periods
+        - **Stress Testing**: Model worst-case scenarios
+        """)
+    
+    with col2:
+        st.markdown("### 🏢 For Businesses")
+        st.markdown("""
+        - **Import/Export Planning**: Forecast currency needs
+        - **Pricing Strategy**: Adjust pricing during volatile periods
+        - **Cash Management**: Optimize currency conversion timing
+        - **Budgeting**: Account for exchange rate risk
+        """)
+    
+    with col3:
+        st.markdown("### 📊 For Analysts & Researchers")
+        st.markdown("""
+        - **Economic Research**: Study sanction impacts
+        - **Policy Analysis**: Evaluate intervention effectiveness
+        - **Predictive Modeling**: Build crisis forecasting models
+        - **Academic Studies**: Publish geopolitical finance research
+        """)
+    
+    st.markdown("---")
+    
+    # Recommendations
+    st.markdown("## 🎯 Recommendations & Next Steps")
+    
+    st.markdown("""
+    ### For Risk Management:
+    1. **Early Warning System**: Monitor 30-day volatility > 5% as crisis indicator
+    2. **Diversification**: Maintain multi-currency reserves during crisis periods
+    3. **Dynamic Hedging**: Increase hedge ratios when volatility exceeds thresholds
+    4. **Scenario Planning**: Prepare for -20% single-day moves during geopolitical events
+    
+    ### For Future Analysis:
+    1. **Machine Learning Models**: Build predictive models using historical patterns
+    2. **Real-time Monitoring**: Integrate live news feeds and API data
+    3. **Sentiment Analysis**: NLP analysis of news headlines for early signals
+    4. **Comparative Studies**: Analyze other emerging market currencies
+    5. **Regime Switching Models**: Identify transitions between normal/crisis states
+    
+    ### Data Enhancement Opportunities:
+    1. Add economic indicators (inflation, GDP, interest rates)
+    2. Include commodity prices (oil, gold)
+    3. Track policy announcements and central bank actions
+    4. Monitor social media sentiment
+    5. Incorporate options market implied volatility
+    """)
+    
+    st.markdown("---")
+    
+    # Technical Details
+    with st.expander("🔧 Technical Methodology"):
+        st.markdown("""
+        ### Crisis Detection Algorithm
+        A day is classified as a "crisis day" if either condition is met:
+        
+        1. **Return Threshold**: Daily return < -5%
+           - Indicates extreme single-day depreciation
+           - Captures sudden market shocks
+        
+        2. **Drawdown Threshold**: Cumulative drawdown ≤ -20%
+           - Measures decline from historical peak
+           - Identifies prolonged depreciation periods
+        
+        The sidebar's **Crisis Rule** can instead use yearly percentiles (as in
+        `analysis.sql`): a day is a crisis day if its return or drawdown is at or
+        below the 5th percentile for its year.
+        
+        ### Risk Metrics Calculated
+        - **Returns**: Daily percentage change in close price
+        - **Volatility**: Rolling standard deviation (7-day, 30-day windows)
+        - **Drawdown**: Percentage below the running maximum within the selected range
+        - **VaR**: Value at Risk at 95% and 99% confidence levels
+        - **CVaR**: Conditional VaR (Expected Shortfall)
+        - **Intraday Volatility**: (High - Low) / Open
+        
+        ### Data Sources
+        - **Exchange Rates**: Historical USD/IRR prices (2011-2025)
+        - **News Data**: GDELT Project API for geopolitical events
+        - **Database**: PostgreSQL for data storage and SQL analytics
+        
+        ### Technologies Used
+        - **Python**: pandas, numpy for data processing
+        - **Visualization**: Plotly for interactive charts
+        - **Dashboard**: Streamlit for web deployment
+        - **Database**: PostgreSQL + SQLAlchemy
+        - **APIs**: GDELT Doc API for news collection
+        """)
+    
+    st.markdown("---")
+    st.markdown("### 📧 Contact & Links")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown("**GitHub Repository**")
+        st.markdown("[View on GitHub](https://github.com/sadaf-rad/Currency-Convertor)")
+    with col2:
+        st.markdown("**Author**")
+        st.markdown("Sadaf Esmaeili Rad")
+    with col3:
+        st.markdown("**Project Type**")
+        st.markdown("Data Analytics Portfolio")
@@ -0,0 +1,71 @@
+"""News impact: GDELT headlines on crisis days"""
+
+import streamlit as st
+
+import figures
+
+
+def render(ctx):
+    news_store = ctx.news_store
+    
+    st.markdown('<p class="main-header">📰 Geopolitical News Impact</p>', unsafe_allow_html=True)
+    
+    if news_store is not None:
+        # Filter news by selected date range
+        news_filtered = news_store.between(ctx.range_start, ctx.range_end)
+        
+        # News metrics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Total Headlines", f"{len(news_filtered):,}")
+        with col2:
+            st.metric("Crisis Days with News", f"{news_filtered['date'].nunique():,}")
+        with col3:
+            st.metric("Unique Sources", f"{news_filtered['source'].nunique():,}")
+        with col4:
+            avg_per_day = len(news_filtered) / max(news_filtered['date'].nunique(), 1)
+            st.metric("Avg Headlines/Day", f"{avg_per_day:.1f}")
+        
+        st.markdown("---")
+        
+        # News over time
+        st.markdown("### 📊 News Volume on Crisis Days")
+        
+        ctx.show_figure('news_volume', lambda: figures.news_volume(news_filtered), deps=('news',))
+        
+        # Top sources
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("### 📰 Top News Sources")
+            ctx.show_figure('top_sources', lambda: figures.top_sources(news_filtered), deps=('news',))
+        
+        with col2:
+            st.markdown("### 📅 News Timeline")
+            ctx.show_figure('news_timeline', lambda: figures.news_timeline(news_filtered), deps=('news',))
+        
+        # Sample headlines
+        st.markdown("### 📄 Recent Headlines on Crisis Days")
+        
+        # Display selector
+        selected_date = st.selectbox(
+            "Select a date to see headlines:",
+            options=sorted(news_filtered['date'].dt.date.unique(), reverse=True)
+        )
+        
+        headlines_for_date = news_store.on_date(selected_date) if selected_date else news_filtered.iloc[:0]
+        
+        if len(headlines_for_date) > 0:
+            st.markdown(f"**{len(headlines_for_date)} headlines on {selected_date}:**")
+            for idx, row in headlines_for_date.iterrows():
+                with st.expander(f"📰 {row['title'][:100]}..."):
+                    st.markdown(f"**Source:** {row['source']}")
+                    st.markdown(f"**URL:** {row['url']}")
+                    st.markdown(f"**Full Title:** {row['title']}")
+        else:
+            st.info("No headlines found for this date.")
+    
+    else:
+        st.warning("📭 News data not available. Run the GDELT API integration to fetch news headlines.")
+        st.info("The news analysis correlates geopolitical events with currency crisis days using the GDELT project API.")
@@ -0,0 +1,96 @@
+"""Overview: headline metrics, price history and crisis years"""
+
+import streamlit as st
+
+import figures
+import rollups
+
+
+def render(ctx):
+    df_filtered = ctx.df_filtered
+    crisis_filtered = ctx.crisis_filtered
+    period_rollup = ctx.period_rollup
+    
+    st.markdown('<p class="main-header">🚨 Iran Currency Crisis Dashboard</p>', unsafe_allow_html=True)
+    st.markdown('<p class="sub-header">USD/IRR Exchange Rate Analysis (2011-2025)</p>', unsafe_allow_html=True)
+    
+    # Key metrics
+    col1, col2, col3, col4, col5 = st.columns(5)
+    
+    with col1:
+        st.metric(
+            "Current Rate",
+            f"{df_filtered['close_price'].iloc[-1]:,.0f}",
+            f"{df_filtered['ret_close_close'].iloc[-1]:.2%}"
+        )
+    
+    with col2:
+        st.metric(
+            "Total Crisis Days",
+            f"{len(crisis_filtered):,}",
+            f"{len(crisis_filtered)/len(df_filtered)*100:.1f}%"
+        )
+    
+    with col3:
+        st.metric(
+            "Avg Daily Return",
+            f"{df_filtered['ret_close_close'].mean():.3%}",
+            "Normal Days"
+        )
+    
+    with col4:
+        st.metric(
+            "30-Day Volatility",
+            f"{df_filtered['vol_30d'].iloc[-1]:.3%}",
+            "Current"
+        )
+    
+    with col5:
+        st.metric(
+            "Max Drawdown",
+            f"{df_filtered['drawdown'].min():.1%}",
+            "In Range"
+        )
+    
+    st.markdown("---")
+    
+    # Main chart
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown("### 📈 Exchange Rate Over Time")
+        
+        ctx.show_figure('price', lambda: figures.price_with_crisis(df_filtered, crisis_filtered))
+    
+    with col2:
+        st.markdown("### 📊 Key Statistics")
+        
+        # Crisis by year
+        yearly = rollups.by_year(period_rollup)
+        yearly_crisis = yearly[['year', 'crisis_days', 'total_days', 'crisis_pct']]
+        
+        # Top crisis years
+        st.markdown("**🔝 Top Crisis Years:**")
+        top_years = yearly_crisis.nlargest(5, 'crisis_days')
+        for _, row in top_years.iterrows():
+            st.markdown(f"- **{int(row['year'])}:** {int(row['crisis_days'])} days ({row['crisis_pct']:.1f}%)")
+        
+        st.markdown("---")
+        
+        # Worst days
+        st.markdown("**📉 Worst Crisis Days:**")
+        worst_days = crisis_filtered.nsmallest(5, 'ret_close_close')[['date_gregorian', 'ret_close_close']]
+        for _, row in worst_days.iterrows():
+            st.markdown(f"- **{row['date_gregorian'].date()}:** {row['ret_close_close']:.2%}")
+    
+    # Additional charts
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 📊 Crisis Distribution by Year")
+        ctx.show_figure('crisis_by_year', lambda: figures.crisis_days_by_year(yearly_crisis))
+    
+    with col2:
+        st.markdown("### 📈 Average Price by Year")
+        yearly_avg = yearly[['year', 'avg_close']].rename(columns={'avg_close': 'close_price'})
+        ctx.show_figure('avg_price_by_year', lambda: figures.avg_price_by_year(yearly_avg))
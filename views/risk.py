@@ -0,0 +1,111 @@
+"""Risk metrics: VaR, CVaR, return distribution and correlations"""
+
+import pandas as pd
+import streamlit as st
+
+import figures
+
+VAR_WINDOW_OPTIONS = [30, 60, 90, 120, 250, 500, 1000]
+
+
+def render(ctx):
+    df_filtered = ctx.df_filtered
+    
+    st.markdown('<p class="main-header">📊 Risk Metrics</p>', unsafe_allow_html=True)
+    
+    # Calculate risk metrics
+    returns = df_filtered['ret_close_close'].dropna()
+    
+    # Value at Risk (VaR)
+    var_95 = returns.quantile(0.05)
+    var_99 = returns.quantile(0.01)
+    
+    # Conditional VaR (CVaR/Expected Shortfall)
+    cvar_95 = returns[returns <= var_95].mean()
+    cvar_99 = returns[returns <= var_99].mean()
+    
+    # Sharpe-like ratio (simplified)
+    avg_return = returns.mean()
+    std_return = returns.std()
+    risk_adjusted_return = avg_return / std_return if std_return != 0 else 0
+    
+    # Display metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("VaR (95%)", f"{var_95:.3%}", help="Maximum expected loss with 95% confidence")
+    with col2:
+        st.metric("VaR (99%)", f"{var_99:.3%}", help="Maximum expected loss with 99% confidence")
+    with col3:
+        st.metric("CVaR (95%)", f"{cvar_95:.3%}", help="Average loss beyond VaR")
+    with col4:
+        st.metric("Risk-Adj Return", f"{risk_adjusted_return:.4f}", help="Return per unit of risk")
+    
+    st.markdown("---")
+    
+    # Risk metrics over time
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        var_col1, var_col2 = st.columns(2)
+        with var_col1:
+            var_window = st.select_slider("VaR window (days)", options=VAR_WINDOW_OPTIONS, value=30)
+        with var_col2:
+            var_confidence = st.select_slider("VaR confidence (%)", options=[90, 95, 99], value=95)
+        
+        st.markdown(f"### 📈 Rolling VaR ({var_confidence}%)")
+        
+        ctx.show_figure(
+            'rolling_var',
+            lambda: figures.rolling_var(
+                df_filtered['date_gregorian'],
+                ctx.metric_service.rolling_var(ctx.range_lo, ctx.range_hi, var_window, 1 - var_confidence / 100),
+                var_window
+            ),
+            var_window, var_confidence
+        )
+    
+    with col2:
+        st.markdown("### 📊 Return Distribution with VaR")
+        
+        ctx.show_figure('return_distribution', lambda: figures.return_distribution(returns, var_95, var_99))
+    
+    # Correlation analysis
+    st.markdown("### 🔗 Feature Correlations")
+    
+    corr_features = ('ret_close_close', 'vol_intraday', 'drawdown', 'vol_7d', 'vol_30d')
+    ctx.show_figure('correlations', lambda: figures.correlation_heatmap(df_filtered, corr_features))
+    
+    # Risk summary table
+    st.markdown("### 📋 Comprehensive Risk Summary")
+    
+    risk_summary = pd.DataFrame({
+        'Metric': [
+            'Average Daily Return',
+            'Return Volatility',
+            'Sharpe-like Ratio',
+            'Maximum Single-Day Loss',
+            'Maximum Drawdown',
+            'VaR 95%',
+            'VaR 99%',
+            'CVaR 95%',
+            'CVaR 99%',
+            'Skewness',
+            'Kurtosis'
+        ],
+        'Value': [
+            f"{avg_return:.4%}",
+            f"{std_return:.4%}",
+            f"{risk_adjusted_return:.4f}",
+            f"{returns.min():.2%}",
+            f"{df_filtered['drawdown'].min():.2%}",
+            f"{var_95:.3%}",
+            f"{var_99:.3%}",
+            f"{cvar_95:.3%}",
+            f"{cvar_99:.3%}",
+            f"{returns.skew():.3f}",
+            f"{returns.kurtosis():.3f}"
+        ]
+    })
+    
+    st.dataframe(risk_summary, use_container_width=True, hide_index=True)
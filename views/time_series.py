@@ -0,0 +1,64 @@
+"""Time series: moving averages, returns, volatility and seasonality"""
+
+import streamlit as st
+
+import figures
+import rollups
+
+# Selectable rolling window lengths (days)
+ROLLING_WINDOW_OPTIONS = [5, 7, 10, 14, 20, 30, 60, 90, 120, 250]
+
+
+def render(ctx):
+    df_filtered = ctx.df_filtered
+    period_rollup = ctx.period_rollup
+    
+    st.markdown('<p class="main-header">📉 Time Series Analysis</p>', unsafe_allow_html=True)
+    
+    # Rolling window lengths for the moving averages and volatility
+    short_window, long_window = st.select_slider(
+        "Rolling windows (days)",
+        options=ROLLING_WINDOW_OPTIONS,
+        value=(7, 30)
+    )
+    ts_frame = ctx.metric_service.frame(ctx.range_lo, ctx.range_hi, windows=(short_window, long_window))
+    
+    # Moving averages
+    st.markdown("### 📈 Price with Moving Averages")
+    
+    ctx.show_figure(
+        'moving_averages',
+        lambda: figures.moving_averages(df_filtered, ts_frame, short_window, long_window),
+        short_window, long_window
+    )
+    
+    # Returns and Volatility
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 📊 Daily Returns Distribution")
+        ctx.show_figure('returns_histogram', lambda: figures.returns_histogram(df_filtered))
+    
+    with col2:
+        st.markdown("### 📈 Rolling Volatility")
+        ctx.show_figure(
+            'rolling_volatility',
+            lambda: figures.rolling_volatility(ts_frame, short_window, long_window),
+            short_window, long_window
+        )
+    
+    # Seasonal patterns
+    st.markdown("### 📅 Seasonal Patterns")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        monthly_avg = rollups.by_month_of_year(period_rollup, ctx.calendar)[['month', 'month_name', 'avg_return']]
+        monthly_avg = monthly_avg.rename(columns={'avg_return': 'ret_close_close'})
+        
+        ctx.show_figure('monthly_returns', lambda: figures.monthly_returns(monthly_avg))
+    
+    with col2:
+        quarterly_crisis = rollups.by_quarter_of_year(period_rollup)[['quarter', 'crisis_days']]
+        quarterly_crisis = quarterly_crisis.rename(columns={'crisis_days': 'is_crisis'})
+        ctx.show_figure('quarterly_crisis', lambda: figures.quarterly_crisis_pie(quarterly_crisis))
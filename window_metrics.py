@@ -0,0 +1,68 @@
+"""
+Range-aware metrics for the selected date window
+Drawdown is measured from the peak inside the window, and rolling metrics
+are warmed up from the rows just before it, so a selected range reports
+its own figures instead of slices of all-history columns
+"""
+
+import pandas as pd
+
+from memo_cache import LRUCache
+from metrics import ROLLING_WINDOWS
+
+
+class RangeMetricService:
+    """Computes and memoizes per-range metrics over one price frame"""
+
+    def __init__(self, df, max_entries=32, max_bytes=None):
+        self.df = df
+        self.close = df['close_price'].to_numpy(dtype=float)
+        self.close.flags.writeable = False
+        self.cache = LRUCache(max_entries, max_bytes)
+
+    def compute(self, lo, hi, windows=ROLLING_WINDOWS):
+        """
+        Metrics for rows [lo, hi)
+        The rolling windows start from up to max(windows) + 1 earlier rows
+        so the first days of the range are not NaN
+        """
+        windows = tuple(windows)
+        warm = min(lo, max(windows) + 1)
+        close = pd.Series(self.close[lo - warm:hi])
+        ret = close.pct_change()
+
+        out = pd.DataFrame(index=self.df.index[lo:hi])
+        in_range = close.iloc[warm:]
+        peak = in_range.cummax()
+        out['running_peak'] = peak.to_numpy()
+        out['drawdown'] = (in_range / peak - 1.0).to_numpy()
+        for window in windows:
+            out[f'vol_{window}d'] = ret.rolling(window=window).std().to_numpy()[warm:]
+        for window in windows:
+            out[f'ma_{window}d'] = close.rolling(window=window).mean().to_numpy()[warm:]
+        return out
+
+    def metrics(self, lo, hi, windows=ROLLING_WINDOWS):
+        """Memoized compute(), keyed on (lo, hi, windows)"""
+        key = (lo, hi, tuple(windows))
+        return self.cache.get_or_compute(key, lambda: self.compute(lo, hi, windows))
+
+    def frame(self, lo, hi, windows=ROLLING_WINDOWS):
+        """The slice [lo, hi) with its range-aware columns swapped in (memoized)"""
+        def build():
+            metrics = self.metrics(lo, hi, windows)
+            return self.df.iloc[lo:hi].assign(**{col: metrics[col] for col in metrics.columns})
+
+        return self.cache.get_or_compute(('frame', lo, hi, tuple(windows)), build)
+
+    def rolling_var(self, lo, hi, window=30, q=0.05):
+        """
+        Rolling q-quantile of daily returns (historical VaR) for rows [lo, hi),
+        warmed up from the preceding `window` rows and memoized per parameters
+        """
+        def build():
+            warm = min(lo, window)
+            ret = pd.Series(self.close[lo - warm:hi]).pct_change()
+            return ret.rolling(window=window).quantile(q).to_numpy()[warm:]
+
+        return self.cache.get_or_compute(('var', lo, hi, window, q), build)